@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date, datetime
 from functools import lru_cache
-from typing import List
+from typing import Tuple
 
 import numpy as np
 import pandas as pd
@@ -20,29 +20,76 @@ class CompoundParams:
     years: int = 20                     # orizzonte (anni)
 
 
-def _date_range_daily(start: date, years: int) -> List[date]:
+_RESULT_COLUMNS = ("value", "contrib", "net_rate", "inflation_value", "real_value")
+
+
+@dataclass(frozen=True, slots=True)
+class CompoundSeries:
+    """Risultato di simulate_compound come array paralleli (stesso significato delle colonne del DataFrame).
+    Gli array sono quelli in cache: in sola lettura, nessuna copia."""
+    index: pd.DatetimeIndex
+    value: np.ndarray
+    contrib: np.ndarray
+    net_rate: np.ndarray
+    inflation_value: np.ndarray
+    real_value: np.ndarray
+
+
+# Oltre questa soglia growth**n (o il suo inverso) rischia l'overflow dei float64
+_MAX_LOG_GROWTH = 600.0
+
+
+def _date_range_daily(start: date, years: int) -> pd.DatetimeIndex:
     """Serie giornaliera da start a start+years (inclusa), robusta per fine mese."""
     end = date(start.year + years, start.month, min(start.day, 28))
-    n = (end - start).days
-    return [start + timedelta(days=i) for i in range(n + 1)]
+    return pd.date_range(start=pd.Timestamp(start), end=pd.Timestamp(end), freq="D")
 
 
-@lru_cache(maxsize=64)
-def simulate_compound(start: date, p: CompoundParams) -> pd.DataFrame:
+def _compound_series(first: float, growth: float, increments: np.ndarray) -> np.ndarray:
     """
-    Simula interesse composto con contribuzioni mensili (il giorno 1 di ogni mese).
-    Ritorna DataFrame indicizzato per data (DatetimeIndex) con colonne:
-      - value            : valore portafoglio nominale (€)
-      - contrib          : contributi cumulati (€)
-      - net_rate         : tasso netto giornaliero applicato (decimale)
-      - inflation_value  : valore che crescerebbe SOLO all'inflazione attesa (€)
-      - real_value       : valore REALE (deflazionato: potere d'acquisto del portafoglio)
-
-    Modello:
-      v[t+1] = v[t]*(1+r_net) + contrib_mese_if_day
-      r_net  = (1+annual_rate)^(1/365)-1 - mgmt_fee_annual/365
-      infl   = (1+inflation_rate)^(1/365)-1
+    Risolve v[0] = first, v[i] = v[i-1]*growth + increments[i] in forma chiusa:
+      v[i] = growth^i * (first + sum_{1<=k<=i} increments[k] * growth^-k)
+    Se growth^n uscirebbe dal range dei float64 la forma chiusa si applica a blocchi
+    abbastanza corti, ripartendo ogni volta dall'ultimo valore del blocco precedente.
     """
+    n = len(increments)
+    out = np.empty(n, dtype=float)
+    if growth <= 0.0:
+        _compound_kernel(first, growth, increments, out)
+        return out
+
+    log_growth = abs(np.log(growth))
+    block = n if log_growth * n < _MAX_LOG_GROWTH else max(1, int(_MAX_LOG_GROWTH / log_growth))
+    pow_growth = np.power(growth, np.arange(block, dtype=float))
+    # come la ricorrenza su float Python: un valore che esce dal range diventa inf senza avvisi
+    with np.errstate(over="ignore"):
+        for lo in range(0, n, block):
+            hi = min(lo + block, n)
+            powers = pow_growth[:hi - lo]
+            scaled = increments[lo:hi] / powers
+            scaled[0] = first if lo == 0 else out[lo - 1] * growth + increments[lo]
+            np.multiply(powers, np.cumsum(scaled), out=out[lo:hi])
+    return out
+
+
+def _compound_kernel(first: float, growth: float, increments: np.ndarray, out: np.ndarray) -> None:
+    """Ricorrenza esplicita scritta in `out` (preallocato): solo per growth <= 0, dove la forma chiusa non vale."""
+    # float Python e lista locale: niente boxing di scalari numpy a ogni passo
+    acc = float(first)
+    growth = float(growth)
+    acc_values = [acc]
+    append = acc_values.append
+    for inc in increments[1:].tolist():
+        acc = acc * growth + inc
+        append(acc)
+    out[:] = acc_values
+
+
+@lru_cache(maxsize=256)
+def _simulate_arrays(start: date, p: CompoundParams) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray,
+                                                               np.ndarray, np.ndarray, np.ndarray]:
+    """Nucleo numerico di simulate_compound: (index, value, contrib, net_rate, inflation_value, real_value).
+    Gli array restano in cache e sono in sola lettura."""
     if p.years <= 0:
         raise ValueError("years must be > 0")
 
@@ -51,32 +98,26 @@ def simulate_compound(start: date, p: CompoundParams) -> pd.DataFrame:
     daily_mgmt  = float(p.mgmt_fee_annual) / 365.0
     daily_net   = daily_gross - daily_mgmt
     daily_infl  = (1.0 + float(p.inflation_rate)) ** (1.0 / 365.0) - 1.0
+    # invarianti calcolati una volta sola
+    growth_net = 1.0 + daily_net
+    growth_infl = 1.0 + daily_infl
+    initial = float(p.initial)
+    monthly = float(p.monthly)
 
-    dates = _date_range_daily(start, p.years)
-    index = pd.to_datetime(dates)
+    index = _date_range_daily(start, p.years)
 
     n_days = len(index)
-    values = np.empty(n_days, dtype=float)
-    contribs = np.empty(n_days, dtype=float)
-    infl_values = np.empty(n_days, dtype=float)
     rates = np.full(n_days, daily_net, dtype=float)
 
-    if p.monthly > 0.0:
-        contrib_increment = np.where(index.day == 1, float(p.monthly), 0.0)
-    else:
-        contrib_increment = np.zeros(n_days, dtype=float)
+    # versamenti sparsi: solo ~12 giorni su 365 ricevono il contributo
+    contrib_increment = np.zeros(n_days, dtype=float)
+    if monthly > 0.0:
+        contrib_increment[index.day.values == 1] = monthly
 
-    initial = float(p.initial)
-    values[0] = initial + contrib_increment[0]
-    contribs[0] = initial + contrib_increment[0]
-    infl_values[0] = initial + contrib_increment[0]
-
-    growth = 1.0 + daily_net
-    infl_growth = 1.0 + daily_infl
-    for i in range(1, n_days):
-        values[i] = values[i - 1] * growth + contrib_increment[i]
-        contribs[i] = contribs[i - 1] + contrib_increment[i]
-        infl_values[i] = infl_values[i - 1] * infl_growth + contrib_increment[i]
+    first = initial + contrib_increment[0]
+    values = _compound_series(first, growth_net, contrib_increment)
+    contribs = initial + np.cumsum(contrib_increment)
+    infl_values = _compound_series(first, growth_infl, contrib_increment)
 
     # fattore di inflazione cumulato e valore reale (deflazionato)
     infl_factor = infl_values / infl_values[0]
@@ -84,11 +125,49 @@ def simulate_compound(start: date, p: CompoundParams) -> pd.DataFrame:
     infl_factor = np.where(infl_factor <= 0, 1.0, infl_factor)
     real_values = values / infl_factor
 
-    df = pd.DataFrame({
-        "value": values,
-        "contrib": contribs,
-        "net_rate": rates,
-        "inflation_value": infl_values,
-        "real_value": real_values,
-    }, index=index)
-    return df
+    arrays = (values, contribs, rates, infl_values, real_values)
+    for arr in arrays:
+        arr.setflags(write=False)
+    return (index,) + arrays
+
+
+def simulate_compound(start: date, p: CompoundParams, dtype=np.float64) -> pd.DataFrame:
+    """
+    Simula interesse composto con contribuzioni mensili (il giorno 1 di ogni mese).
+    Ritorna DataFrame indicizzato per data (DatetimeIndex) con colonne:
+      - value            : valore portafoglio nominale (€)
+      - contrib          : contributi cumulati (€)
+      - net_rate         : tasso netto giornaliero applicato (decimale)
+      - inflation_value  : valore che crescerebbe SOLO all'inflazione attesa (€)
+      - real_value       : valore REALE (deflazionato: potere d'acquisto del portafoglio)
+
+    Modello:
+      v[t+1] = v[t]*(1+r_net) + contrib_mese_if_day
+      r_net  = (1+annual_rate)^(1/365)-1 - mgmt_fee_annual/365
+      infl   = (1+inflation_rate)^(1/365)-1
+
+    dtype: dtype delle colonne (tutte, incluse inflation_value e real_value).
+    I calcoli restano in float64; float32 dimezza la memoria con errore relativo ~1e-6.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise ValueError("dtype must be a floating point type")
+    if isinstance(start, datetime):
+        start = start.date()
+    index, *arrays = _simulate_arrays(start, p)
+    # Un solo blocco float64 contiguo (una copia, niente inferenza di dtype):
+    # modificare il DataFrame restituito non tocca la cache
+    block = np.vstack(arrays, dtype=dtype)
+    return pd.DataFrame(block.T, index=index, columns=_RESULT_COLUMNS, copy=False)
+
+
+def simulate_compound_arrays(start: date, p: CompoundParams) -> CompoundSeries:
+    """Come simulate_compound, ma senza costruire il DataFrame: per chi legge solo gli array (es. il grafico)."""
+    if isinstance(start, datetime):
+        start = start.date()
+    return CompoundSeries(*_simulate_arrays(start, p))
+
+
+def clear_simulation_cache() -> None:
+    """Svuota la cache delle simulazioni (utile nei test)."""
+    _simulate_arrays.cache_clear()
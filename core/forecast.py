@@ -1,17 +1,106 @@
 # core/forecast.py
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+import time
 from datetime import date, datetime
-from typing import Optional
-from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+from functools import lru_cache, wraps
 
 import numpy as np
 import pandas as pd
 import yfinance as yf
 
 
+# ------------------ cache su disco dei download ------------------
+_DISK_CACHE_DIR = Path.home() / ".cache" / "timelineapp" / "yf"
+_RECENT_TTL_SECONDS = 24 * 3600      # intervalli recenti: i dati possono ancora cambiare
+_FROZEN_AFTER_DAYS = 90              # intervalli chiusi da più di 90 giorni: cache permanente
+
+
+def _disk_cache_path(key: str, recent: bool = False) -> Path:
+    # i file di intervalli ancora recenti al salvataggio hanno un suffisso proprio: scadono e vengono potati
+    suffix = ".recent.pkl" if recent else ".pkl"
+    return _DISK_CACHE_DIR / (hashlib.sha1(key.encode("utf-8")).hexdigest() + suffix)
+
+
+def _disk_cache_load(key: str, end_iso: str):
+    end = date.fromisoformat(end_iso)
+    for path in (_disk_cache_path(key), _disk_cache_path(key, recent=True)):
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        # conta la data del download, non quella di oggi: un file scaricato quando l'intervallo
+        # era recente (magari senza l'ultima seduta) non diventa mai permanente
+        frozen = (date.fromtimestamp(mtime) - end).days > _FROZEN_AFTER_DAYS
+        if not frozen and time.time() - mtime > _RECENT_TTL_SECONDS:
+            continue
+        try:
+            return pd.read_pickle(path)
+        except Exception:
+            # file corrotto o illeggibile: si riscarica
+            return None
+    return None
+
+
+def _disk_cache_prune_recent() -> None:
+    """Rimuove i file di intervalli recenti scaduti: con end = oggi la chiave cambia ogni giorno."""
+    now = time.time()
+    for path in _DISK_CACHE_DIR.glob("*.recent.pkl"):
+        with contextlib.suppress(OSError):
+            if now - path.stat().st_mtime > _RECENT_TTL_SECONDS:
+                path.unlink()
+
+
+def _disk_cache_store(key: str, value, end_iso: str) -> None:
+    recent = (date.today() - date.fromisoformat(end_iso)).days <= _FROZEN_AFTER_DAYS
+    tmp = None
+    try:
+        _DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=_DISK_CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        pd.to_pickle(value, tmp)
+        # rename atomico: lettori concorrenti vedono il file vecchio o quello completo
+        os.replace(tmp, _disk_cache_path(key, recent))
+    except (OSError, pickle.PicklingError):
+        if tmp is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+        return
+    if recent:
+        _disk_cache_prune_recent()
+
+
+def _is_empty_download(value) -> bool:
+    if isinstance(value, dict):
+        return all(s.empty for s in value.values())
+    return value.empty
+
+
+def _disk_cached(fn):
+    """Memoizza su disco una funzione (..., start_iso, end_iso); i risultati vuoti non vengono salvati."""
+    @wraps(fn)
+    def wrapper(*args):
+        key = repr((fn.__name__,) + args)
+        cached = _disk_cache_load(key, args[-1])
+        if cached is not None:
+            return cached
+        value = fn(*args)
+        if not _is_empty_download(value):
+            _disk_cache_store(key, value, args[-1])
+        return value
+    return wrapper
+
+
 # ------------------ utilità base ------------------
 @lru_cache(maxsize=128)
+@_disk_cached
 def _cached_adj_close(ticker: str, start_iso: str, end_iso: str) -> pd.Series:
     end_ts = pd.Timestamp(end_iso)
     df = yf.download(
@@ -41,6 +130,40 @@ def _fetch_adj_close(ticker: str, start: date | datetime, end: date | datetime)
     return series.copy()
 
 
+@lru_cache(maxsize=32)
+@_disk_cached
+def _cached_adj_close_many(tickers: Tuple[str, ...], start_iso: str, end_iso: str) -> Dict[str, pd.Series]:
+    end_ts = pd.Timestamp(end_iso)
+    df = yf.download(
+        tickers=" ".join(tickers),
+        start=start_iso,
+        end=(end_ts + pd.Timedelta(days=1)).date().isoformat(),
+        auto_adjust=False,
+        progress=False,
+        group_by="ticker",
+        threads=True,
+    )
+    out: Dict[str, pd.Series] = {}
+    for ticker in tickers:
+        s = pd.Series(dtype=float)
+        if df is not None and len(df) > 0:
+            if isinstance(df.columns, pd.MultiIndex):
+                if ticker in df.columns.get_level_values(0):
+                    s = df[ticker]["Adj Close"]
+            elif "Adj Close" in df.columns:
+                s = df["Adj Close"]
+        out[ticker] = s.dropna().sort_index()
+    return out
+
+
+def _fetch_adj_close_many(tickers: Sequence[str], start: date | datetime, end: date | datetime) -> Dict[str, pd.Series]:
+    """Scarica più ticker con una sola chiamata a yfinance (download paralleli nella stessa sessione)."""
+    start_date = pd.Timestamp(start).date()
+    end_date = pd.Timestamp(end).date()
+    series = _cached_adj_close_many(tuple(tickers), start_date.isoformat(), end_date.isoformat())
+    return {ticker: s.copy() for ticker, s in series.items()}
+
+
 def _estimate_cagr(series: pd.Series, years_window: float) -> float:
     """
     CAGR sugli ultimi 'years_window' anni (fallback: tutta la serie).
@@ -49,15 +172,25 @@ def _estimate_cagr(series: pd.Series, years_window: float) -> float:
         return 0.0
     end = series.index[-1]
     start_cut = end - pd.DateOffset(years=years_window)
-    w = series[series.index >= start_cut]
-    if len(w) < 30:
-        w = series
-        years = max((w.index[-1] - w.index[0]).days / 365.25, 0.25)
+    # serie ordinata: il punto di taglio si trova per bisezione, senza slicing
+    pos = int(series.index.searchsorted(start_cut, side="left"))
+    n = len(series)
+    if n - pos < 30:
+        pos = 0
+        years = max((series.index[-1] - series.index[0]).days / 365.25, 0.25)
     else:
         years = years_window
-    if years <= 0 or len(w) < 2:
+    if years <= 0 or n - pos < 2:
         return 0.0
-    return (float(w.iloc[-1]) / float(w.iloc[0])) ** (1.0 / years) - 1.0
+    return (float(series.iloc[-1]) / float(series.iloc[pos])) ** (1.0 / years) - 1.0
+
+
+def _project(last_price: float, last_date: pd.Timestamp, daily: float,
+             future_index: pd.DatetimeIndex) -> pd.Series:
+    """Proietta last_price sulle date future con crescita giornaliera composta 'daily'."""
+    days = np.maximum((future_index - last_date).days.to_numpy(), 0)
+    vals = last_price * np.power(1.0 + daily, days.astype(np.float64))
+    return pd.Series(vals, index=future_index)
 
 
 def forecast_from_history(hist: pd.Series, future_index: pd.DatetimeIndex, *, lookback_years: int = 5) -> pd.Series:
@@ -71,11 +204,7 @@ def forecast_from_history(hist: pd.Series, future_index: pd.DatetimeIndex, *, lo
     last_price = float(hist.iloc[-1])
     last_date = pd.Timestamp(hist.index[-1])
     daily = (1.0 + g) ** (1.0 / 365.25) - 1.0
-    vals = []
-    for d in future_index:
-        days = max(0, int((pd.Timestamp(d) - last_date).days))
-        vals.append(last_price * ((1.0 + daily) ** days))
-    return pd.Series(vals, index=future_index)
+    return _project(last_price, last_date, daily, future_index)
 
 
 # ------------------ CAGR-X con proxy macro Yahoo ------------------
@@ -125,9 +254,10 @@ def forecast_cagrx_from_yfinance(
     start = end - pd.DateOffset(years=max(macro_years, 3))
 
     # Proxy macro
-    tnx = _fetch_adj_close("^TNX", start, end).apply(_tnx_to_decimal)
-    vix = _fetch_adj_close("^VIX", start, end)
-    dxy = _fetch_adj_close("DX-Y.NYB", start, end)
+    macro = _fetch_adj_close_many(("^TNX", "^VIX", "DX-Y.NYB"), start, end)
+    tnx = macro["^TNX"].apply(_tnx_to_decimal)
+    vix = macro["^VIX"]
+    dxy = macro["DX-Y.NYB"]
 
     z_tnx = _zscore_last(tnx)
     z_vix = _zscore_last(vix)
@@ -148,9 +278,4 @@ def forecast_cagrx_from_yfinance(
     last_price = float(hist.iloc[-1])
     last_date = pd.Timestamp(hist.index[-1])
     daily = (1.0 + g) ** (1.0 / 365.25) - 1.0
-
-    vals = []
-    for d in future_index:
-        days = max(0, int((pd.Timestamp(d) - last_date).days))
-        vals.append(last_price * ((1.0 + daily) ** days))
-    return pd.Series(vals, index=future_index)
+    return _project(last_price, last_date, daily, future_index)
@@ -1,8 +1,11 @@
+import sys
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict
+import numpy as np
 import pandas as pd
 from .models import Event, PersonInfo
-from .parsing import parse_eventi_field, parse_date, parse_personal_data, parse_personal_details
+from .parsing import parse_date, parse_dates_array, parse_eventi_column, parse_personal_details_column
 
 # Nomi colonne attesi (case-insensitive)
 EXPECTED = {
@@ -16,35 +19,34 @@ EXPECTED = {
     "cognome": "Cognome",
 }
 
+# BOM rimosso e spazio non separabile -> spazio, in un solo passaggio
+_NORMTAB = str.maketrans({"\ufeff": "", "\xa0": " "})
+
+
+def _normalize_column(col: str) -> str:
+    x = (col or "").translate(_NORMTAB).strip().lower()
+    return x[:-1] if x.endswith(":") else x
+
+
 def _map_columns(df: pd.DataFrame) -> Tuple[str, List[str], List[str], Optional[str], Optional[str], Optional[str]]:
     """Ritorna le colonne (submission, eventi_personali, eventi_a_carico, nome, cognome, dati_personali). Gestisce BOM e due punti finali."""
-    def normalize(col: str) -> str:
-        x = (col or "").strip().lstrip("\ufeff").lower()
-        x = x.replace("\xa0", " ")
-        if x.endswith(":"):
-            x = x[:-1]
-        return x
-    subm_col = None
-    eventi_cols: List[str] = []
-    eventi_dep_cols: List[str] = []
-    nome_col: Optional[str] = None
-    cognome_col: Optional[str] = None
-    dati_pers_col: Optional[str] = None
-
-    for raw_col in df.columns:
-        norm = normalize(raw_col)
-        if norm == "submission date":
-            subm_col = raw_col
-        elif norm in ("eventi", "eventi personali"):
-            eventi_cols.append(raw_col)
-        elif norm in ("eventi familiari a carico", "eventi familiari"):
-            eventi_dep_cols.append(raw_col)
-        elif norm == "nome":
-            nome_col = raw_col
-        elif norm == "cognome":
-            cognome_col = raw_col
-        elif norm == "dati personali":
-            dati_pers_col = raw_col
+    subm_col, eventi_cols, eventi_dep_cols, nome_col, cognome_col, dati_pers_col = _map_column_names(tuple(df.columns))
+    # le liste in cache sono condivise: al chiamante vanno copie
+    return subm_col, list(eventi_cols), list(eventi_dep_cols), nome_col, cognome_col, dati_pers_col
+
+
+@lru_cache(maxsize=32)
+def _map_column_names(columns: Tuple[str, ...]) -> Tuple[str, List[str], List[str], Optional[str], Optional[str], Optional[str]]:
+    # una sola normalizzazione per colonna; a parità di nome vince l'ultima, come nel loop originale
+    normalized = [(_normalize_column(c), c) for c in columns]
+    norm_to_raw = {norm: raw for norm, raw in normalized}
+
+    subm_col = norm_to_raw.get("submission date")
+    eventi_cols = [raw for norm, raw in normalized if norm in ("eventi", "eventi personali")]
+    eventi_dep_cols = [raw for norm, raw in normalized if norm in ("eventi familiari a carico", "eventi familiari")]
+    nome_col = norm_to_raw.get("nome")
+    cognome_col = norm_to_raw.get("cognome")
+    dati_pers_col = norm_to_raw.get("dati personali")
 
     if not (subm_col and (eventi_cols or eventi_dep_cols) and (dati_pers_col or nome_col)):
         raise ValueError(
@@ -54,106 +56,165 @@ def _map_columns(df: pd.DataFrame) -> Tuple[str, List[str], List[str], Optional[
     return subm_col, eventi_cols, eventi_dep_cols, nome_col, cognome_col, dati_pers_col
 
 
-def load_events_csv(path: str) -> Tuple[List[Event], dict]:
-    df = pd.read_csv(path, encoding="utf-8-sig", dtype=str, keep_default_na=False)
-    subm_col, eventi_cols, eventi_dep_cols, nome_col, cognome_col, dati_pers_col = _map_columns(df)
+# Formati giorno-prima della "Submission Date" (il primo è il default Jotform):
+# danno lo stesso risultato di pd.to_datetime(dayfirst=True) senza passare da pandas
+SUBMISSION_FORMATS = (
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+)
 
-    def _parse_submission(value: object) -> datetime:
-        raw = str(value or "").strip()
-        if not raw:
-            return datetime.min
-        parsed = pd.to_datetime(raw, dayfirst=True, utc=False, errors="coerce")
-        if pd.isna(parsed):
-            parsed = pd.to_datetime(raw, dayfirst=False, utc=False, errors="coerce")
-        if pd.isna(parsed):
-            return datetime.min
-        if isinstance(parsed, pd.Timestamp):
-            if parsed.tzinfo is not None:
-                parsed = parsed.tz_convert(None)
-            return parsed.to_pydatetime()
-        if isinstance(parsed, datetime):
+
+@lru_cache(maxsize=16384)
+def _fast_parse(raw: str) -> datetime:
+    """Parse della submission: prima i formati noti via strptime, poi il parser generico di pandas."""
+    if not raw:
+        return datetime.min
+    for fmt in SUBMISSION_FORMATS:
+        try:
+            parsed = datetime.strptime(raw, fmt)
+        except ValueError:
+            continue
+        # strptime accetta anche anni a 2 cifre con %Y: lasciali a pandas
+        if parsed.year >= 1000:
             return parsed
+    parsed = pd.to_datetime(raw, dayfirst=True, utc=False, errors="coerce")
+    if pd.isna(parsed):
+        parsed = pd.to_datetime(raw, dayfirst=False, utc=False, errors="coerce")
+    if pd.isna(parsed):
         return datetime.min
+    if isinstance(parsed, pd.Timestamp):
+        if parsed.tzinfo is not None:
+            parsed = parsed.tz_convert(None)
+        return parsed.to_pydatetime()
+    if isinstance(parsed, datetime):
+        return parsed
+    return datetime.min
 
-    def _extract_person(row: pd.Series) -> Tuple[str, Optional[PersonInfo]]:
-        full_name = ""
-        info: Optional[PersonInfo] = None
-        if dati_pers_col:
-            details = parse_personal_details(row.get(dati_pers_col, ""))
-            nome = (details.get("nome", "") or "").strip()
-            cognome = (details.get("cognome", "") or "").strip()
-            full_name = f"{nome} {cognome}".strip()
-            sesso = (details.get("sesso", "") or "").strip()
-            nascita_str = (details.get("nascita_str", "") or "").strip()
-            nascita_dt = parse_date(nascita_str) if nascita_str else None
-            if full_name:
-                info = PersonInfo(
-                    nome=nome or full_name,
-                    cognome=cognome,
-                    sesso=sesso,
-                    nascita=nascita_dt,
-                )
-        if not full_name and nome_col:
-            nome = (str(row.get(nome_col, "")) or "").strip()
-            cognome = (str(row.get(cognome_col, "")) or "").strip() if cognome_col else ""
-            full_name = f"{nome} {cognome}".strip() if cognome_col else nome
+
+def _parse_submission(value: str) -> datetime:
+    return _fast_parse(value.strip())
+
+
+def _read_events_frame(path: str) -> pd.DataFrame:
+    """Legge dal CSV solo le colonne usate, tutte come stringhe.
+
+    Parser C e non pyarrow: le celle eventi dell'export contengono testo multiriga tra virgolette,
+    che pyarrow per default rifiuta (e a cavallo dei blocchi rischia di leggere male)."""
+    header = pd.read_csv(path, encoding="utf-8-sig", dtype=str, keep_default_na=False, nrows=0)
+    subm_col, eventi_cols, eventi_dep_cols, nome_col, cognome_col, dati_pers_col = _map_columns(header)
+    usecols = [
+        col for col in (subm_col, *eventi_cols, *eventi_dep_cols, nome_col, cognome_col, dati_pers_col)
+        if col
+    ]
+    return pd.read_csv(path, encoding="utf-8-sig", dtype=str, keep_default_na=False, usecols=usecols)
+
+
+def load_events_csv(path: str) -> Tuple[List[Event], dict]:
+    df = _read_events_frame(path)
+    subm_col, eventi_cols, eventi_dep_cols, nome_col, cognome_col, dati_pers_col = _map_columns(df)
+
+    subm_values = df[subm_col].tolist()
+    # Dati Personali: un solo passaggio vettoriale su tutta la colonna
+    details = parse_personal_details_column(df[dati_pers_col]) if dati_pers_col else None
+    if details is not None:
+        det_nome = details["nome"].tolist()
+        det_cognome = details["cognome"].tolist()
+        det_sesso = details["sesso"].tolist()
+        det_nascita = details["nascita_str"].tolist()
+    nome_values = df[nome_col].tolist() if nome_col else None
+    cognome_values = df[cognome_col].tolist() if cognome_col else None
+
+    event_columns: List[Tuple[bool, str]] = []
+    for col in eventi_cols:
+        event_columns.append((False, col))
+    for col in eventi_dep_cols:
+        event_columns.append((True, col))
+    event_values = [df[col].tolist() for _, col in event_columns]
+
+    # nomi completi internati: le righe della stessa persona (e i suoi Event) condividono un'unica stringa
+    name_cache: Dict[Tuple[str, str], str] = {}
+
+    def _full_name(nome: str, cognome: str) -> str:
+        key = (nome, cognome)
+        full_name = name_cache.get(key)
+        if full_name is None:
+            full_name = name_cache[key] = sys.intern(f"{nome} {cognome}".strip())
+        return full_name
+
+    def _person_fields(i: int) -> Tuple[str, str, str, str, str]:
+        """(full_name, nome, cognome, sesso, nascita_str) della riga i: solo stringhe, nessun oggetto."""
+        if details is not None:
+            nome = det_nome[i]
+            cognome = det_cognome[i]
+            full_name = _full_name(nome, cognome)
             if full_name:
-                info = PersonInfo(
-                    nome=nome or full_name,
-                    cognome=cognome if cognome_col else "",
-                    sesso="",
-                    nascita=None,
-                )
-        return full_name, info
-
-    selected_forms: Dict[str, Dict[str, object]] = {}
-    for _, row in df.iterrows():
-        full_name, info = _extract_person(row)
-        if not full_name:
-            continue
-        submission_dt = _parse_submission(row.get(subm_col))
-        existing = selected_forms.get(full_name)
-        if existing is None or submission_dt >= existing["submission"]:
-            selected_forms[full_name] = {
-                "row": row.copy(),
-                "submission": submission_dt,
-                "info": info,
-            }
+                return full_name, nome, cognome, det_sesso[i], det_nascita[i]
+        if nome_values is not None:
+            nome = nome_values[i].strip()
+            cognome = cognome_values[i].strip() if cognome_values is not None else ""
+            return _full_name(nome, cognome), nome, cognome, "", ""
+        return "", "", "", "", ""
+
+    # Una sola compilazione per persona: vince la submission più recente
+    # (a parità di data l'ultima riga del CSV, come nel confronto con '>=').
+    # Per ogni riga si tiene solo la posizione: PersonInfo ed eventi si costruiscono sulle superstiti.
+    persons = [_person_fields(i) for i in range(len(df))]
+    forms = pd.DataFrame({
+        "name": [fields[0] for fields in persons],
+        "submission": pd.Series([_parse_submission(v) for v in subm_values], dtype="datetime64[us]"),
+    })
+    forms = forms[forms["name"] != ""]
+    latest = forms.iloc[::-1].groupby("name", sort=False)["submission"].idxmax()
+    latest = latest.reindex(pd.unique(forms["name"]))
 
-    events: List[Event] = []
     people: Dict[str, PersonInfo] = {}
-    for full_name, payload in selected_forms.items():
-        row = payload["row"]
-        info = payload.get("info") or PersonInfo(nome=full_name, cognome="", sesso="", nascita=None)
+    # testi eventi delle compilazioni superstiti, in ordine persona -> colonna
+    owners: List[str] = []
+    texts: List[str] = []
+    defaults: List[bool] = []
+    for full_name, pos in latest.items():
+        _, nome, cognome, sesso, nascita_str = persons[pos]
+        info = PersonInfo(
+            nome=nome or full_name,
+            cognome=cognome,
+            sesso=sesso,
+            nascita=parse_date(nascita_str) if nascita_str else None,
+        )
         people[full_name] = info
 
-        event_columns: List[Tuple[bool, str]] = []
-        for col in eventi_cols:
-            event_columns.append((False, col))
-        for col in eventi_dep_cols:
-            event_columns.append((True, col))
-
-        for default_dep, col in event_columns:
-            text = str(row.get(col, "")).strip()
-            if not text:
-                continue
-            extracted = parse_eventi_field(text, default_is_dependent=default_dep)
-            for ev in extracted:
-                dt = parse_date(ev["DataEvento"])
-                if dt is None:
-                    # scarta eventi con data non valida
-                    continue
-                familiare = ev.get("Familiare", "") or ""
-                is_dep = bool(ev.get("Acarico", False)) or default_dep
-                events.append(Event(
-                    nome=full_name,
-                    titolo=ev["Titolo"],
-                    categoria=ev["Categoria"],
-                    data_str=ev["DataEvento"],
-                    dt=dt,
-                    familiare=familiare if is_dep else "",
-                    is_dependent=is_dep,
-                    costo=ev.get("Costo"),
-                ))
-    events_sorted = sorted(events, key=lambda e: e.dt)
+        for (default_dep, _), values in zip(event_columns, event_values):
+            text = values[pos].strip()
+            if text:
+                owners.append(full_name)
+                texts.append(text)
+                defaults.append(default_dep)
+
+    # tutti gli eventi in un solo passaggio vettoriale
+    parsed = parse_eventi_column(pd.Series(texts, dtype=object), defaults)
+    events: List[Event] = []
+    # alias locali per il loop caldo
+    append_event = events.append
+    intern = sys.intern
+    # date degli eventi risolte in blocco (NaT = data non valida): l'array fa anche da chiave di ordinamento
+    stamps = parse_dates_array(parsed["DataEvento"].tolist())
+    for (row, titolo, categoria, data_str, familiare, is_dep, costo), dt in zip(
+            parsed.itertuples(index=False), stamps.tolist()):
+        if dt is None:
+            # scarta eventi con data non valida
+            continue
+        # argomenti posizionali, nell'ordine dei campi di Event
+        append_event(Event(
+            owners[row],
+            intern(titolo),
+            intern(categoria),
+            data_str,
+            dt,
+            familiare if is_dep else "",
+            bool(is_dep),
+            costo,
+        ))
+    # ordinamento stabile per data via numpy, senza confronti tra datetime Python
+    order = np.argsort(stamps[~np.isnat(stamps)], kind="stable")
+    events_sorted = [events[i] for i in order.tolist()]
     return events_sorted, people
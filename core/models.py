@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Event:
     nome: str               # Capofamiglia (Nome Cognome)
     titolo: str
@@ -14,7 +14,7 @@ class Event:
     costo: Optional[str] = None  # Valore del campo Costo così come nel CSV
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PersonInfo:
     nome: str
     cognome: str
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Tuple
+import csv
 import os
 
 
@@ -14,43 +15,44 @@ class MortalityTableLoader:
         self.sep = sep
 
     def load_table(self, path: str) -> Dict[int, int]:
-        table: Dict[int, int] = {}
         if not path or not os.path.exists(path):
-            return table
+            return {}
 
-        # Tollerante all'header ed a encoding con BOM
+        # Tollerante all'header ed a encoding con BOM: il file viene letto in streaming
+        # e, se la decodifica fallisce, riletto da capo con l'encoding successivo
         encodings = ("utf-8-sig", "utf-8", "latin-1")
         last_err: Exception | None = None
         for enc in encodings:
             try:
-                with open(path, "r", encoding=enc, errors="strict") as f:
-                    lines = f.read().splitlines()
-                break
+                with open(path, "r", encoding=enc, errors="strict", newline="") as f:
+                    return self._parse_rows(self._rows(f))
             except Exception as e:
                 last_err = e
-                lines = None  # type: ignore
-        if lines is None:  # type: ignore
-            # Nessun encoding è andato a buon fine
-            raise last_err if last_err else RuntimeError(f"Impossibile leggere il file: {path}")
-
-        # Salta header, poi parse semplice delle due colonne separate da ';'
-        for i, raw in enumerate(lines):
-            line = (raw or "").strip()
-            if not line:
+        # Nessun encoding è andato a buon fine
+        raise last_err if last_err else RuntimeError(f"Impossibile leggere il file: {path}")
+
+    def _rows(self, f: Iterable[str]) -> Iterable[List[str]]:
+        # csv.reader accetta solo separatori di un carattere: per gli altri resta lo split semplice
+        if len(self.sep) == 1:
+            return csv.reader(f, delimiter=self.sep)
+        return (line.split(self.sep) for line in f)
+
+    @staticmethod
+    def _parse_rows(rows: Iterable[List[str]]) -> Dict[int, int]:
+        table: Dict[int, int] = {}
+        for i, row in enumerate(rows):
+            if len(row) < 2:
                 continue
+            first = row[0].strip()
             # Salta riga header (prima riga o righe con testo non numerico in prima colonna)
-            parts = [p.strip() for p in line.split(self.sep)]
-            if len(parts) < 2:
-                continue
-            if i == 0 and not parts[0].isdigit():
+            if i == 0 and not first.isdigit():
                 continue
-            # In caso di header con testo anche oltre la prima riga, filtra righe non numeriche
-            if not parts[0].replace(" ", "").isdigit():
+            if not first.replace(" ", "").isdigit():
                 continue
             try:
-                age = int(parts[0].split()[0])  # "Età x" -> 0
-                years_left = int(float(parts[1].replace(",", ".")))
-            except Exception:
+                age = int(first.split()[0])  # "Età x" -> 0
+                years_left = int(float(row[1].strip().replace(",", ".")))
+            except (ValueError, OverflowError):
                 continue
             if age >= 0 and years_left >= 0:
                 table[age] = years_left
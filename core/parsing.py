@@ -1,6 +1,10 @@
 import re
 from datetime import datetime
-from typing import List, Optional, Dict, Tuple
+from functools import lru_cache
+from typing import List, Optional, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
 
 # ======================
 # Parsing campo "Eventi"
@@ -27,29 +31,44 @@ EVENTI_REGEX_V3 = re.compile(
     re.IGNORECASE,
 )
 
-
+# v3 | v2 | v1 in un'unica regex: una sola search per riga invece di fino a tre.
+# Tutte le varianti iniziano con "Titolo": il prefisso comune sta fuori dall'alternanza.
+EVENTI_REGEX_ALL = re.compile(
+    "Titolo(?:"
+    "(?P<v3>" + EVENTI_REGEX_V3.pattern[len("Titolo"):] + ")"
+    "|(?P<v2>" + EVENTI_REGEX_V2.pattern[len("Titolo"):] + ")"
+    "|(?P<v1>" + EVENTI_REGEX_V1.pattern[len("Titolo"):] + "))",
+    re.IGNORECASE,
+)
+# posizione (1-based) del primo gruppo interno di ciascuna variante in EVENTI_REGEX_ALL
+_V3_FIRST = 2
+_V2_FIRST = _V3_FIRST + EVENTI_REGEX_V3.groups + 1
+_V1_FIRST = _V2_FIRST + EVENTI_REGEX_V2.groups + 1
+
+
+_CATEGORIE = {
+    "progetto": "progetto",
+    "desiderio": "desiderio",
+    "bisogno": "bisogno",
+    # categorie legacy ricondotte a quelle nuove
+    "famiglia": "progetto",
+    "acquisti": "bisogno",
+    "obiettivi": "progetto",
+    "lavoro": "progetto",
+    "studio": "progetto",
+    "salute": "bisogno",
+    "finanze": "bisogno",
+    "sogni": "desiderio",
+    "carriera": "progetto",
+    "istruzione": "progetto",
+}
+
+
+@lru_cache(maxsize=128)
 def _norm_cat(cat: str) -> str:
     """Normalizza categorie su {bisogno, progetto, desiderio} (fallback: originale)."""
     c = (cat or "").strip().lower()
-    mapping = {
-        "progetto": "progetto",
-        "desiderio": "desiderio",
-        "bisogno": "bisogno",
-    }
-    legacy = {
-        # categorie legacy ricondotte a quelle nuove
-        "famiglia": "progetto",
-        "acquisti": "bisogno",
-        "obiettivi": "progetto",
-        "lavoro": "progetto",
-        "studio": "progetto",
-        "salute": "bisogno",
-        "finanze": "bisogno",
-        "sogni": "desiderio",
-        "carriera": "progetto",
-        "istruzione": "progetto",
-    }
-    return mapping.get(c) or legacy.get(c) or c
+    return _CATEGORIE.get(c, c)
 
 
 def parse_eventi_field(txt: str, default_is_dependent: bool = False) -> List[Dict[str, str]]:
@@ -63,98 +82,215 @@ def parse_eventi_field(txt: str, default_is_dependent: bool = False) -> List[Dic
     if not txt:
         return out
 
+    # globali del modulo legati a locali: il loop non ripete i LOAD_GLOBAL
+    search = EVENTI_REGEX_ALL.search
+    flexible = _parse_event_line_flexible
+    strict = _parse_event_line_strict
+    from_match = _event_from_match
     for raw_line in str(txt).splitlines():
-        line = raw_line.strip().strip(',')
-        if not line:
-            continue
+        m = search(raw_line)
+        if m is None:
+            line = raw_line.strip().strip(',')
+            parsed = flexible(line) if line else None
+            if not parsed:
+                continue
+        elif raw_line.lower().count("titolo") > 1:
+            # più eventi sulla stessa riga: rispetta la priorità v3 > v2 > v1 delle search separate
+            parsed = strict(raw_line.strip().strip(','))
+        else:
+            parsed = from_match(m)
+
+        # Normalizza costo (stringa oppure None)
+        costo_raw = parsed.get("Costo")
+        costo_str = (str(costo_raw).strip() if costo_raw is not None else "")
+        parsed["Costo"] = costo_str or None
+
+        acarico_flag = bool(parsed.get("Acarico"))
+        if default_is_dependent:
+            acarico_flag = True
+        parsed["Acarico"] = acarico_flag
+
+        if acarico_flag:
+            fam = (parsed.get("Familiare") or "").strip()
+            parsed["Familiare"] = fam
+        out.append(parsed)
+    return out
 
-        parsed = _parse_event_line_strict(line)
+
+def _event_from_match(m: re.Match) -> Dict[str, object]:
+    """Costruisce l'evento dalla variante (v3, v2 o v1) che ha prodotto il match di EVENTI_REGEX_ALL."""
+    # il gruppo esterno si chiude dopo quelli interni: lastgroup è il nome della variante
+    first, last, build = _VARIANTS[m.lastgroup]
+    return build(*m.group(*range(first, last)))
+
+
+# Separatori di riga riconosciuti da str.splitlines()
+_LINE_SPLIT_REGEX = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+_TITOLO_REGEX = re.compile("titolo", re.IGNORECASE)
+_YES_VALUES = {"si", "sì", "yes", "y", "true", "1"}
+_FLEX_PAIR_REGEX = re.compile(r"([^:]+):\s*([^,]*)")
+EVENTI_COLUMNS = ["row", "Titolo", "Categoria", "DataEvento", "Familiare", "Acarico", "Costo"]
+
+
+def parse_eventi_column(values: pd.Series, default_is_dependent=False) -> pd.DataFrame:
+    """
+    Versione vettoriale di parse_eventi_field su un'intera colonna.
+    Le righe interne vengono esplose e passate a v3, poi v2, poi v1 con Series.str.extract;
+    solo le righe non riconosciute ricadono sul parser flessibile riga per riga.
+    default_is_dependent: bool oppure una sequenza di bool allineata a values.
+    Ritorna un DataFrame con colonne EVENTI_COLUMNS, dove 'row' è la posizione in values;
+    l'ordine è quello di parse_eventi_field applicato riga per riga.
+    """
+    texts = pd.Series(values, dtype=object).reset_index(drop=True).fillna("")
+    if np.ndim(default_is_dependent) == 0:
+        defaults = np.full(len(texts), bool(default_is_dependent))
+    else:
+        defaults = np.asarray(default_is_dependent, dtype=bool)
+
+    lines = texts.str.split(_LINE_SPLIT_REGEX).explode()
+    lines = lines.str.strip().str.strip(",")
+    lines = lines[lines.notna() & (lines != "")]
+    rows = lines.index.to_numpy()
+    lines = lines.reset_index(drop=True)
+
+    n = len(lines)
+    titolo = np.empty(n, dtype=object)
+    categoria = np.empty(n, dtype=object)
+    data_ev = np.empty(n, dtype=object)
+    familiare = np.full(n, "", dtype=object)
+    acarico = np.zeros(n, dtype=bool)
+    costo = np.full(n, "", dtype=object)
+    # prefiltro economico: senza "titolo" nessuna variante (né il parser flessibile) può riconoscere la riga
+    # (re e non str.contains: sul dtype "str" il backend pyarrow ha un case folding diverso da re.IGNORECASE)
+    search_titolo = _TITOLO_REGEX.search
+    candidate = np.fromiter((search_titolo(line) is not None for line in lines.tolist()), dtype=bool, count=n)
+    pending = candidate.copy()
+
+    def _take(regex: re.Pattern) -> Tuple[np.ndarray, pd.DataFrame]:
+        idx = np.flatnonzero(pending)
+        ex = lines.iloc[idx].str.extract(regex)
+        hit = ex[0].notna().to_numpy()
+        ex = ex[hit].fillna("")
+        idx = idx[hit]
+        pending[idx] = False
+        titolo[idx] = ex[0].str.strip().to_numpy()
+        categoria[idx] = ex[1].map(_norm_cat).to_numpy()
+        data_ev[idx] = ex[2].str.strip().to_numpy()
+        return idx, ex
+
+    # v3: A Carico? esplicito
+    idx, ex = _take(EVENTI_REGEX_V3)
+    dep = ex[4].str.strip().str.lower().isin(_YES_VALUES).to_numpy()
+    acarico[idx] = dep
+    familiare[idx] = np.where(dep, ex[5].str.strip().to_numpy(), "")
+    costo[idx] = ex[3].to_numpy()
+    # v2: a carico se c'è il nome del familiare
+    idx, ex = _take(EVENTI_REGEX_V2)
+    fam = ex[4].str.strip().to_numpy()
+    acarico[idx] = fam != ""
+    familiare[idx] = fam
+    costo[idx] = ex[3].to_numpy()
+    # v1: solo titolo, categoria, data
+    _take(EVENTI_REGEX_V1)
+
+    # righe non riconosciute: parser flessibile, riga per riga
+    keep = candidate & ~pending
+    for i in np.flatnonzero(pending):
+        parsed = _parse_event_line_flexible(lines.iat[i])
         if not parsed:
-            parsed = _parse_event_line_flexible(line)
-        if parsed:
-            # Normalizza costo (stringa oppure None)
-            costo_raw = parsed.get("Costo")
-            costo_str = (str(costo_raw).strip() if costo_raw is not None else "")
-            parsed["Costo"] = costo_str or None
-
-            acarico_flag = bool(parsed.get("Acarico"))
-            if default_is_dependent:
-                acarico_flag = True
-            parsed["Acarico"] = acarico_flag
-
-            if acarico_flag:
-                fam = (parsed.get("Familiare") or "").strip()
-                parsed["Familiare"] = fam
-            out.append(parsed)
-    return out
+            continue
+        keep[i] = True
+        titolo[i] = parsed["Titolo"]
+        categoria[i] = parsed["Categoria"]
+        data_ev[i] = parsed["DataEvento"]
+        familiare[i] = parsed["Familiare"]
+        acarico[i] = parsed["Acarico"]
+        costo[i] = parsed["Costo"] or ""
+
+    # object esplicito: pandas inferirebbe "str" trasformando None in NaN
+    costo = pd.Series([c.strip() or None for c in costo], dtype=object)
+    out = pd.DataFrame({
+        "row": rows,
+        "Titolo": titolo,
+        "Categoria": categoria,
+        "DataEvento": data_ev,
+        "Familiare": familiare,
+        "Acarico": acarico | defaults[rows],
+        "Costo": costo,
+    }, columns=EVENTI_COLUMNS)
+    return out[keep].reset_index(drop=True)
 
 
 def _parse_event_line_strict(line: str) -> Optional[Dict[str, object]]:
-    # prova v3
-    m = EVENTI_REGEX_V3.search(line)
-    if m:
-        titolo = (m.group(1) or "").strip()
-        categoria = _norm_cat(m.group(2) or "")
-        data_ev = (m.group(3) or "").strip()
-        costo = (m.group(4) or "").strip()
-        acarico_raw = (m.group(5) or "").strip().lower()
-        fam = (m.group(6) or "").strip()
-        yes_vals = {"si", "sì", "yes", "y", "true", "1"}
-        is_dep = acarico_raw in yes_vals
-        return {
-            "Titolo": titolo,
-            "Categoria": categoria,
-            "DataEvento": data_ev,
-            "Familiare": fam if is_dep else "",
-            "Acarico": is_dep,
-            "Costo": costo or None,
-        }
-    # prova v2
-    m = EVENTI_REGEX_V2.search(line)
-    if m:
-        titolo = (m.group(1) or "").strip()
-        categoria = _norm_cat(m.group(2) or "")
-        data_ev = (m.group(3) or "").strip()
-        costo = (m.group(4) or "").strip() if getattr(m.re, 'groups', 0) >= 4 else ""
-        fam = (m.group(5) or "").strip() if getattr(m.re, 'groups', 0) >= 5 else ""
-        acarico = bool(fam)
-        return {
-            "Titolo": titolo,
-            "Categoria": categoria,
-            "DataEvento": data_ev,
-            "Familiare": fam if acarico else "",
-            "Acarico": acarico,
-            "Costo": costo or None,
-        }
-    # prova v1
-    m = EVENTI_REGEX_V1.search(line)
-    if m:
-        titolo = (m.group(1) or "").strip()
-        categoria = _norm_cat(m.group(2) or "")
-        data_ev = (m.group(3) or "").strip()
-        return {
-            "Titolo": titolo,
-            "Categoria": categoria,
-            "DataEvento": data_ev,
-            "Familiare": "",
-            "Acarico": False,
-            "Costo": None,
-        }
+    # prova v3, poi v2, poi v1
+    for search, build in _STRICT_PARSERS:
+        m = search(line)
+        if m:
+            return build(*m.groups())
     return None
 
 
-def _parse_event_line_flexible(line: str) -> Optional[Dict[str, object]]:
-    def norm_key(k: str) -> str:
-        return (k or '').strip().lower().replace('  ', ' ')
+def _event_v3(titolo, categoria, data_ev, costo, acarico_raw, fam) -> Dict[str, object]:
+    is_dep = (acarico_raw or "").strip().lower() in _YES_VALUES
+    fam = (fam or "").strip()
+    return {
+        "Titolo": (titolo or "").strip(),
+        "Categoria": _norm_cat(categoria or ""),
+        "DataEvento": (data_ev or "").strip(),
+        "Familiare": fam if is_dep else "",
+        "Acarico": is_dep,
+        "Costo": (costo or "").strip() or None,
+    }
+
+
+def _event_v2(titolo, categoria, data_ev, costo, fam) -> Dict[str, object]:
+    fam = (fam or "").strip()
+    acarico = bool(fam)
+    return {
+        "Titolo": (titolo or "").strip(),
+        "Categoria": _norm_cat(categoria or ""),
+        "DataEvento": (data_ev or "").strip(),
+        "Familiare": fam if acarico else "",
+        "Acarico": acarico,
+        "Costo": (costo or "").strip() or None,
+    }
+
+
+def _event_v1(titolo, categoria, data_ev) -> Dict[str, object]:
+    return {
+        "Titolo": (titolo or "").strip(),
+        "Categoria": _norm_cat(categoria or ""),
+        "DataEvento": (data_ev or "").strip(),
+        "Familiare": "",
+        "Acarico": False,
+        "Costo": None,
+    }
+
+
+# variante di EVENTI_REGEX_ALL -> (primo gruppo, gruppo dopo l'ultimo, costruttore)
+_VARIANTS = {
+    "v3": (_V3_FIRST, _V2_FIRST - 1, _event_v3),
+    "v2": (_V2_FIRST, _V1_FIRST - 1, _event_v2),
+    "v1": (_V1_FIRST, EVENTI_REGEX_ALL.groups + 1, _event_v1),
+}
 
-    yes_vals = {"si", "sì", "yes", "y", "true", "1"}
+# search legate una volta sola, nell'ordine di priorità
+_STRICT_PARSERS = (
+    (EVENTI_REGEX_V3.search, _event_v3),
+    (EVENTI_REGEX_V2.search, _event_v2),
+    (EVENTI_REGEX_V1.search, _event_v1),
+)
+
+
+def _parse_event_line_flexible(line: str) -> Optional[Dict[str, object]]:
+    yes_vals = _YES_VALUES
     # estrae key:value separati da virgola nella stessa riga
-    pairs = re.findall(r"([^:]+):\s*([^,]*)", line)
+    pairs = _FLEX_PAIR_REGEX.findall(line)
     if not pairs:
         return None
     d: Dict[str, str] = {}
     for k, v in pairs:
-        d[norm_key(k)] = v.strip()
+        d[k.strip().lower().replace('  ', ' ')] = v.strip()
 
     titolo = d.get("titolo evento") or d.get("titolo") or ""
     cat = d.get("categoria") or ""
@@ -195,7 +331,12 @@ def parse_personal_data(txt: str) -> Tuple[str, str]:
     """Estrae (nome, cognome) dal campo 'Dati Personali'."""
     if not txt:
         return "", ""
-    m = PERSONA_REGEX.search(str(txt))
+    return _personal_data_str(str(txt))
+
+
+@lru_cache(maxsize=1024)
+def _personal_data_str(s: str) -> Tuple[str, str]:
+    m = PERSONA_REGEX.search(s)
     if not m:
         return "", ""
     nome = (m.group(1) or "").strip()
@@ -210,13 +351,40 @@ NASCITA_REGEX = re.compile(r"Data\s+Di\s+Nascita:\s*([0-9]{1,4}[\/-][0-9]{1,2}[\
 
 def parse_personal_details(txt: str) -> Dict[str, Optional[str]]:
     """Ritorna dict: {nome, cognome, sesso, nascita_str} dal campo 'Dati Personali'."""
-    s = str(txt or "")
+    nome, cognome, sesso, nascita_str = _personal_details_str(str(txt or ""))
+    return {"nome": nome, "cognome": cognome, "sesso": sesso, "nascita_str": nascita_str}
+
+
+@lru_cache(maxsize=1024)
+def _personal_details_str(s: str) -> Tuple[str, str, str, str]:
+    # tupla immutabile in cache: il dict pubblico viene ricostruito a ogni chiamata
     nome, cognome = parse_personal_data(s)
     sesso_m = SESSO_REGEX.search(s)
     nasc_m = NASCITA_REGEX.search(s)
     sesso = (sesso_m.group(1).strip() if sesso_m else "")
     nascita_str = (nasc_m.group(1).strip() if nasc_m else "")
-    return {"nome": nome, "cognome": cognome, "sesso": sesso, "nascita_str": nascita_str}
+    return nome, cognome, sesso, nascita_str
+
+
+def parse_personal_details_column(values: pd.Series) -> pd.DataFrame:
+    """
+    Versione vettoriale di parse_personal_details su un'intera colonna:
+    stesse regex, eseguite da Series.str.extract. Ritorna un DataFrame con
+    colonne {nome, cognome, sesso, nascita_str} (stringhe, "" se assenti).
+    """
+    # una compilazione ripetuta ha lo stesso testo: le regex girano solo sui valori distinti
+    codes, uniques = pd.factorize(values.astype(str).fillna(""))
+    s = pd.Series(uniques, dtype=object)
+    persona = s.str.extract(PERSONA_REGEX)
+    parsed = pd.DataFrame({
+        "nome": persona[0],
+        "cognome": persona[1],
+        "sesso": s.str.extract(SESSO_REGEX)[0],
+        "nascita_str": s.str.extract(NASCITA_REGEX)[0],
+    }).fillna("").apply(lambda col: col.str.strip())
+    out = parsed.iloc[codes]
+    out.index = values.index
+    return out
 
 
 # =====================
@@ -235,36 +403,108 @@ def parse_date(date_str: str) -> Optional[datetime]:
     """
     if not date_str:
         return None
-    s = str(date_str).strip()
-    parts = re.split(r"[\/-]", s)
-    if len(parts) != 3 or any(not p.isdigit() for p in parts):
+    return _parse_date_str(str(date_str).strip())
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(s: str) -> Optional[datetime]:
+    # le stesse date si ripetono tra eventi: il risultato (immutabile) resta in cache
+    # Fast path ASCII per i formati a 10 caratteri DD/MM/YYYY e YYYY-MM-DD: niente split
+    if len(s) == 10 and s.isascii():
+        if s[2] in "/-" and s[5] in "/-":
+            a_s, b_s, c_s = s[:2], s[3:5], s[6:]
+        elif s[4] in "/-" and s[7] in "/-":
+            a_s, b_s, c_s = s[:4], s[5:7], s[8:]
+        else:
+            a_s = b_s = c_s = ""
+        if a_s.isdigit() and b_s.isdigit() and c_s.isdigit():
+            return _resolve_date(int(a_s), int(b_s), int(c_s))
+
+    parts = s.replace("/", "-").split("-")
+    if len(parts) != 3:
+        return None
+    a_s, b_s, c_s = parts
+    if not (a_s.isdigit() and b_s.isdigit() and c_s.isdigit()):
+        return None
+    return _resolve_date(int(a_s), int(b_s), int(c_s))
+
+
+def _try_build(day: int, month: int, year: int) -> Optional[datetime]:
+    try:
+        return datetime(year, month, day)
+    except ValueError:
         return None
-    a, b, c = map(int, parts)
 
-    def try_build(day: int, month: int, year: int) -> Optional[datetime]:
-        try:
-            return datetime(year, month, day)
-        except ValueError:
-            return None
 
+def _resolve_date(a: int, b: int, c: int) -> Optional[datetime]:
     # Caso YYYY-M-D
     if a > 999:
-        return try_build(c, b, a)
+        return _try_build(c, b, a)
 
     # Caso anno alla fine (piu comune nei nostri CSV)
     if c > 999:
         # Prima prova interpretazione D-M-Y
-        dt = try_build(a, b, c)
+        dt = _try_build(a, b, c)
         if dt is not None:
             return dt
         # Se il mese risulta invalido, prova interpretazione M-D-Y
-        dt = try_build(b, a, c)
+        dt = _try_build(b, a, c)
         if dt is not None:
             return dt
         return None
 
     # Fallback: data con anno corto al termine, tenta D-M-Y
     if 1 <= b <= 12:
-        return try_build(a, b, c)
+        return _try_build(a, b, c)
 
     return None
+
+
+_DATE_PARTS_REGEX = re.compile(r"([0-9]{1,9})[/-]([0-9]{1,9})[/-]([0-9]{1,9})")
+
+
+def _valid_ymd(y: np.ndarray, m: np.ndarray, d: np.ndarray) -> np.ndarray:
+    leap = (y % 4 == 0) & ((y % 100 != 0) | (y % 400 == 0))
+    month_days = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[np.clip(m, 1, 12) - 1]
+    month_days = month_days + ((m == 2) & leap)
+    return (y >= 1) & (y <= 9999) & (m >= 1) & (m <= 12) & (d >= 1) & (d <= month_days)
+
+
+def parse_dates(values: Sequence[str]) -> List[Optional[datetime]]:
+    """
+    Versione vettoriale di parse_date (stesse regole, non il parser 'mixed' di pandas):
+    le stringhe N/N/N in cifre ASCII sono risolte con numpy, le altre ricadono su parse_date.
+    """
+    return parse_dates_array(values).tolist()
+
+
+def parse_dates_array(values: Sequence[str]) -> np.ndarray:
+    """Come parse_dates, ma ritorna un array datetime64[us] con NaT per le date non valide."""
+    texts = pd.Series([str(v or "").strip() for v in values], dtype=object)
+    parts = texts.str.fullmatch(_DATE_PARTS_REGEX).to_numpy(dtype=bool)
+    ex = texts[parts].str.extract(_DATE_PARTS_REGEX).astype(np.int64)
+    a, b, c = (ex[i].to_numpy() for i in range(3))
+
+    # Caso YYYY-M-D, poi anno alla fine D-M-Y con fallback M-D-Y, poi anno corto D-M-Y
+    year_first = a > 999
+    year_last = ~year_first & (c > 999)
+    short = ~year_first & ~year_last & (b >= 1) & (b <= 12)
+    dmy_ok = _valid_ymd(c, b, a)
+    mdy_ok = _valid_ymd(c, a, b)
+    swap = year_last & ~dmy_ok & mdy_ok
+
+    year = np.where(year_first, a, c)
+    month = np.where(year_first, b, np.where(swap, a, b))
+    day = np.where(year_first, c, np.where(swap, b, a))
+    ok = (year_first & _valid_ymd(a, b, c)) | (year_last & (dmy_ok | mdy_ok)) | (short & dmy_ok)
+
+    out = np.full(len(texts), np.datetime64("NaT"), dtype="datetime64[us]")
+    if ok.any():
+        months = ((year[ok] - 1970) * 12 + (month[ok] - 1)).astype("datetime64[M]")
+        out[np.flatnonzero(parts)[ok]] = months.astype("datetime64[D]") + (day[ok] - 1)
+    # formati non riconosciuti dal percorso vettoriale: parser scalare
+    for i in np.flatnonzero(~parts).tolist():
+        dt = parse_date(texts.iat[i])
+        if dt is not None:
+            out[i] = np.datetime64(dt, "us")
+    return out
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import re
+import unicodedata
+from dataclasses import dataclass
 from datetime import date
-from typing import Callable, List, Optional, Sequence
-
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QBrush, QColor, QFont, QPainter, QPen, QPageLayout
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import (
+    QBrush, QColor, QFont, QFontMetricsF, QPainter, QPainterPath, QPen, QPageLayout, QPicture, QStaticText,
+    QTextOption, QTransform,
+)
 from PyQt6.QtPrintSupport import QPrinter
 from PyQt6.QtWidgets import QGraphicsScene
 
@@ -13,53 +21,176 @@ from core.models import Event
 FontFactory = Callable[[int, List[str]], QFont]
 CategoryColorResolver = Callable[[Optional[str]], QColor]
 
+# tutto ciò che non è lettera, cifra, spazio, '-' o '_' diventa separatore
+_SLUG_RE = re.compile(r"[^\w \-]")
+_categoria = attrgetter("categoria")
+
+
+# (cognome presente, nome presente) -> base del nome file; si valuta solo il formato scelto
+_BASE_FORMATS: Dict[Tuple[bool, bool], Callable[[str, str], str]] = {
+    (True, True): lambda last, first: f"{last}_{first}_timeline",
+    (True, False): lambda last, first: f"{last}_timeline",
+    (False, True): lambda last, first: f"{first}_timeline",
+    (False, False): lambda last, first: "timeline",
+}
+
+
+@lru_cache(maxsize=1024)
+def _slugify(value: str) -> str:
+    return "_".join(_SLUG_RE.sub(" ", value).split()).lower()
+
 
 def default_pdf_filename(person: Optional[str], *, today: Optional[date] = None) -> str:
     """Restituisce il nome file PDF richiesto.
     Formato: cognome_nome_timeline_gg-mm-aaaa.pdf (senza slash per compatibilità FS).
     """
     today = today or date.today()
-    today_token = today.strftime("%d-%m-%Y")
-    person = (person or "").strip()
+    return f"{_compute_base((person or '').strip())}_{today.strftime('%d-%m-%Y')}.pdf"
 
-    def _slugify(value: str) -> str:
-        cleaned = "".join(ch if ch.isalnum() or ch in (" ", "-", "_") else " " for ch in value)
-        return "_".join(part for part in cleaned.strip().split()).lower()
 
+@lru_cache(maxsize=256)
+def _compute_base(person: str) -> str:
+    """Parte del nome file che dipende solo dalla persona (cognome_nome_timeline)."""
     if not person:
-        base = "timeline"
+        return "timeline"
+    ascii_only = unicodedata.normalize("NFKD", person)
+    if not ascii_only.isascii():
+        # toglie gli accenti (segni combinanti) lasciando le altre lettere non ASCII
+        ascii_only = "".join(ch for ch in ascii_only if not unicodedata.combining(ch))
+
+    parts = [p for p in ascii_only.replace("-", " ").split() if p]
+    if len(parts) >= 2:
+        first = parts[0]
+        last = " ".join(parts[1:])
+    elif parts:
+        first = parts[0]
+        last = ""
     else:
-        try:
-            import unicodedata
-
-            norm = unicodedata.normalize("NFKD", person)
-            ascii_only = "".join(ch for ch in norm if not unicodedata.combining(ch))
-        except Exception:
-            ascii_only = person
-
-        parts = [p for p in ascii_only.replace("-", " ").split() if p]
-        if len(parts) >= 2:
-            first = parts[0]
-            last = " ".join(parts[1:])
-        elif parts:
-            first = parts[0]
-            last = ""
-        else:
-            first = ""
-            last = ""
-
-        first_slug = _slugify(first)
-        last_slug = _slugify(last)
-        if last_slug and first_slug:
-            base = f"{last_slug}_{first_slug}_timeline"
-        elif last_slug:
-            base = f"{last_slug}_timeline"
-        elif first_slug:
-            base = f"{first_slug}_timeline"
-        else:
-            base = "timeline"
+        first = ""
+        last = ""
+
+    first_slug = _slugify(first)
+    last_slug = _slugify(last)
+    return _BASE_FORMATS[bool(last_slug), bool(first_slug)](last_slug, first_slug)
 
-    return f"{base}_{today_token}.pdf"
+
+def _static_text(text: str, font: QFont, width: Optional[float] = None) -> QStaticText:
+    """QStaticText preparato una volta: la shaping del testo non si ripete a ogni disegno.
+    Con width il testo è centrato orizzontalmente in quella larghezza.
+    """
+    st = QStaticText(text)
+    st.setTextFormat(Qt.TextFormat.PlainText)
+    if width is not None:
+        st.setTextWidth(width)
+        st.setTextOption(QTextOption(Qt.AlignmentFlag.AlignHCenter))
+    st.prepare(QTransform(), font)
+    return st
+
+
+@dataclass(frozen=True, slots=True)
+class LegendLayout:
+    """Legenda misurata e impaginata una volta, con coordinate relative al suo angolo in alto a sinistra:
+    il disegno non richiama font metrics né category_color_fn e non crea geometrie."""
+    header_font: QFont
+    entry_font: QFont
+    total_height: float
+    header_text: QStaticText
+    entries: List[Tuple[str, QColor, QStaticText]]
+    text_positions: List[QPointF]
+    # un QPainterPath con tutti i campioni di ciascun colore, con il suo QBrush
+    swatch_paths: List[Tuple[QBrush, QPainterPath]]
+
+
+def _legend_layout(
+    events: Sequence[Event],
+    header_font: QFont,
+    entry_font: QFont,
+    printer: QPrinter,
+    page_height_px: float,
+    text_offset: float,
+    category_color_fn: CategoryColorResolver,
+) -> LegendLayout:
+    """Categorie distinte (prima occorrenza, confronto case-insensitive) con colori, testi e posizioni già pronti."""
+    # prima i valori grezzi distinti (hash in C), poi strip/lower solo su quelli
+    by_key: Dict[str, str] = {}
+    for raw in dict.fromkeys(map(_categoria, events)):
+        cat = (raw or "").strip()
+        if cat:
+            by_key.setdefault(cat.lower(), cat)
+    categories = list(by_key.values())
+
+    line_spacing = max(6.0, page_height_px * 0.01)
+    swatch_size = max(12.0, page_height_px * 0.016)
+    header_h = QFontMetricsF(header_font, printer).height()
+    text_h = QFontMetricsF(entry_font, printer).height()
+    entry_h = max(swatch_size, text_h)
+    swatch_offset = (entry_h - swatch_size) / 2.0
+    # testo centrato in verticale sulla riga, come AlignVCenter
+    text_dy = (entry_h - text_h) / 2.0
+    text_x = swatch_size + text_offset
+
+    entries: List[Tuple[str, QColor, QStaticText]] = []
+    text_positions: List[QPointF] = []
+    paths: Dict[int, Tuple[QBrush, QPainterPath]] = {}
+    y = header_h + line_spacing
+    for cat in categories:
+        color = category_color_fn(cat)
+        entries.append((cat, color, _static_text(cat, entry_font)))
+        text_positions.append(QPointF(text_x, y + text_dy))
+        group = paths.get(color.rgba())
+        if group is None:
+            group = paths[color.rgba()] = (QBrush(color), QPainterPath())
+        group[1].addRect(QRectF(0.0, y + swatch_offset, swatch_size, swatch_size))
+        y += entry_h + line_spacing
+
+    total_height = 0.0
+    if categories:
+        total_height = (
+            header_h
+            + line_spacing
+            + len(categories) * entry_h
+            + max(0, len(categories) - 1) * line_spacing
+        )
+        total_height += line_spacing
+    return LegendLayout(
+        header_font=header_font,
+        entry_font=entry_font,
+        total_height=total_height,
+        header_text=_static_text("Legenda", header_font),
+        entries=entries,
+        text_positions=text_positions,
+        swatch_paths=list(paths.values()),
+    )
+
+
+def _record_scene(scene: QGraphicsScene, source: QRectF) -> QPicture:
+    """Registra la scena una volta in un QPicture (vettoriale), da riprodurre su ogni pagina."""
+    picture = QPicture()
+    rec = QPainter(picture)
+    try:
+        rec.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        rec.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
+        scene.render(rec, source, source)
+    finally:
+        rec.end()
+    return picture
+
+
+def _draw_scene_picture(painter: QPainter, picture: QPicture, source: QRectF, target: QRectF) -> None:
+    """Riproduce il QPicture in target come scene.render con KeepAspectRatio (ancorato in alto a sinistra, ritagliato)."""
+    scale = min(target.width() / max(source.width(), 1e-9), target.height() / max(source.height(), 1e-9))
+    transform = QTransform()
+    transform.translate(target.left(), target.top())
+    transform.scale(scale, scale)
+    transform.translate(-source.left(), -source.top())
+    # in riproduzione QPicture scala di suo da DPI di registrazione a DPI del device: va compensato
+    device = painter.device()
+    transform.scale(picture.logicalDpiX() / device.logicalDpiX(), picture.logicalDpiY() / device.logicalDpiY())
+    painter.setClipRect(target)
+    painter.setTransform(transform)
+    painter.drawPicture(0, 0, picture)
+    painter.resetTransform()
+    painter.setClipping(False)
 
 
 def paint_timeline_to_printer(
@@ -97,6 +228,11 @@ def paint_timeline_to_printer(
         title_font = make_font(title_font_size, ["Bold", "Black", "DemiBold"])
         date_font = make_font(date_font_size, ["Medium", "Normal"])
         legend_font = make_font(legend_font_size, ["Normal", "Light"])
+        legend_header_font = make_font(max(legend_font_size, int(legend_font_size * 1.1)), ["Bold", "DemiBold", "Medium"])
+
+        # altezze misurate una volta sola, sulla risoluzione della stampante
+        title_h = QFontMetricsF(title_font, printer).height()
+        date_h = QFontMetricsF(date_font, printer).height()
 
         text_pen = QPen(label_color)
         painter.setPen(text_pen)
@@ -108,50 +244,30 @@ def paint_timeline_to_printer(
 
         current_y = target.top() + top_padding
 
+        # drawStaticText usa il font del painter: setFont resta necessario
         painter.setFont(title_font)
-        title_metrics = painter.fontMetrics()
-        title_height = title_metrics.height()
-        title_rect = QRectF(target.left(), current_y, target.width(), title_height)
-        painter.drawText(title_rect, Qt.AlignmentFlag.AlignCenter, title_text)
-        current_y += title_height + between_title_date
+        painter.drawStaticText(
+            QPointF(target.left(), current_y), _static_text(title_text, title_font, target.width())
+        )
+        current_y += title_h + between_title_date
 
         painter.setFont(date_font)
-        date_metrics = painter.fontMetrics()
-        date_height = date_metrics.height()
-        date_rect = QRectF(target.left(), current_y, target.width(), date_height)
-        painter.drawText(date_rect, Qt.AlignmentFlag.AlignCenter, today_display)
-        current_y += date_height + after_header_gap
-
-        legend_entries: List[str] = []
-        seen_categories = set()
-        for ev in events:
-            cat = (getattr(ev, "categoria", "") or "").strip()
-            key = cat.lower()
-            if not cat or key in seen_categories:
-                continue
-            seen_categories.add(key)
-            legend_entries.append(cat)
-
-        legend_height = 0.0
-        legend_line_spacing = max(6.0, page_height_px * 0.01)
-        swatch_size = max(12.0, page_height_px * 0.016)
-
-        if legend_entries:
-            painter.setFont(make_font(max(legend_font_size, int(legend_font_size * 1.1)), ["Bold", "DemiBold", "Medium"]))
-            legend_header_metrics = painter.fontMetrics()
-            legend_header_height = legend_header_metrics.height()
-            painter.setFont(legend_font)
-            legend_metrics = painter.fontMetrics()
-            entry_height = max(swatch_size, float(legend_metrics.height()))
-            legend_height = (
-                legend_header_height
-                + legend_line_spacing
-                + len(legend_entries) * entry_height
-                + max(0, len(legend_entries) - 1) * legend_line_spacing
-            )
-            legend_height += legend_line_spacing
-
-        chart_bottom_limit = target.bottom() - (legend_height + (legend_gap if legend_entries else 0))
+        painter.drawStaticText(
+            QPointF(target.left(), current_y), _static_text(today_display, date_font, target.width())
+        )
+        current_y += date_h + after_header_gap
+
+        legend = _legend_layout(
+            events,
+            legend_header_font,
+            legend_font,
+            printer,
+            page_height_px,
+            max(8.0, target.width() * 0.01),
+            category_color_fn,
+        )
+
+        chart_bottom_limit = target.bottom() - (legend.total_height + (legend_gap if legend.entries else 0))
         chart_top = current_y
         chart_rect_height = chart_bottom_limit - chart_top
         if chart_rect_height <= 0:
@@ -159,37 +275,28 @@ def paint_timeline_to_printer(
         else:
             chart_rect = QRectF(target.left(), chart_top, target.width(), chart_rect_height)
 
-        scene.render(
-            painter,
-            chart_rect,
-            source,
-            Qt.AspectRatioMode.KeepAspectRatio,
-        )
+        _draw_scene_picture(painter, _record_scene(scene, source), source, chart_rect)
+        # la vista può usare DontSavePainterState: pen e brush lasciati dagli item vanno reimpostati
+        painter.setPen(text_pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
 
-        if legend_entries:
+        if legend.entries:
             legend_left = chart_rect.left() + max(20.0, target.width() * 0.035)
             legend_top = chart_rect.bottom() + legend_gap
-            painter.setFont(make_font(max(legend_font_size, int(legend_font_size * 1.1)), ["Bold", "DemiBold", "Medium"]))
-            legend_header_metrics = painter.fontMetrics()
-            header_height = legend_header_metrics.height()
-            header_rect = QRectF(legend_left, legend_top, target.width() * 0.4, header_height)
-            painter.drawText(header_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "Legenda")
-
-            painter.setFont(legend_font)
-            legend_metrics = painter.fontMetrics()
-            entry_height = max(swatch_size, float(legend_metrics.height()))
-            y = header_rect.bottom() + legend_line_spacing
-            swatch_offset = (entry_height - swatch_size) / 2.0
-            text_offset = max(8.0, target.width() * 0.01)
-
-            for cat in legend_entries:
-                cat_color = category_color_fn(cat)
-                swatch_rect = QRectF(legend_left, y + swatch_offset, swatch_size, swatch_size)
-                painter.fillRect(swatch_rect, QBrush(cat_color))
-                painter.drawRect(swatch_rect)
-
-                text_rect = QRectF(swatch_rect.right() + text_offset, y, target.width() * 0.4, entry_height)
-                painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, cat)
-                y += entry_height + legend_line_spacing
+            # geometrie già pronte in coordinate relative: basta spostare l'origine
+            painter.translate(legend_left, legend_top)
+            painter.setFont(legend.header_font)
+            painter.drawStaticText(QPointF(0.0, 0.0), legend.header_text)
+
+            painter.setFont(legend.entry_font)
+            for (_, _, text), pos in zip(legend.entries, legend.text_positions):
+                painter.drawStaticText(pos, text)
+
+            # campioni in blocco: riempimento e bordo di ogni colore nella stessa drawPath
+            for brush, path in legend.swatch_paths:
+                painter.setBrush(brush)
+                painter.drawPath(path)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.translate(-legend_left, -legend_top)
     finally:
         painter.end()
@@ -1,6 +1,7 @@
 # core/plots.py
+from operator import attrgetter
 from typing import List
-import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from .models import Event
@@ -29,21 +30,17 @@ def build_timeline_figure(events: List[Event], person: str) -> go.Figure:
         fig.update_yaxes(visible=False, showticklabels=False)
         return fig
 
-    # DataFrame ordinato
-    df = pd.DataFrame([
-        {
-            "dt": e.dt,
-            "Titolo": e.titolo,
-            "Categoria": e.categoria,
-        }
-        for e in sorted(events, key=lambda x: x.dt)
-    ])
+    # Colonne ordinate come liste/array semplici: Plotly non richiede pandas
+    sorted_events = sorted(events, key=attrgetter("dt"))
+    dts = [e.dt for e in sorted_events]
+    titles = [e.titolo for e in sorted_events]
+    cats = np.array([e.categoria for e in sorted_events], dtype=object).reshape(-1, 1)
 
     # Linea di base (y=0)
-    y0 = [0] * len(df)
+    y0 = np.zeros(len(dts))
     fig.add_trace(
         go.Scatter(
-            x=df["dt"],
+            x=dts,
             y=y0,
             mode="lines",
             line=dict(width=2, color="#A0A0A0"),
@@ -55,13 +52,13 @@ def build_timeline_figure(events: List[Event], person: str) -> go.Figure:
     # Marker + etichette
     fig.add_trace(
         go.Scatter(
-            x=df["dt"],
+            x=dts,
             y=y0,
             mode="markers+text",
-            text=df["Titolo"],
+            text=titles,
             textposition="top center",
             marker=dict(size=12),
-            customdata=df[["Categoria"]],
+            customdata=cats,
             hovertemplate="<b>%{text}</b><br>%{customdata[0]}<br>%{x|%Y-%m-%d}<extra></extra>",
             showlegend=False,
         )
@@ -71,8 +68,8 @@ def build_timeline_figure(events: List[Event], person: str) -> go.Figure:
     fig.update_yaxes(visible=False, showticklabels=False)
 
     # Tick solo sulle date evento
-    ticks = sorted(df["dt"].unique())
-    if len(ticks) > 0:
+    ticks = sorted(set(dts))
+    if ticks:
         fig.update_xaxes(tickvals=ticks)
 
     return fig
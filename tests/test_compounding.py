@@ -3,7 +3,13 @@ from datetime import date
 import numpy as np
 import pytest
 
-from core.compounding import CompoundParams, simulate_compound
+from core.compounding import (
+    CompoundParams,
+    _compound_kernel,
+    _compound_series,
+    simulate_compound,
+    simulate_compound_arrays,
+)
 
 
 def test_simulate_compound_applies_monthly_contributions_on_first_day():
@@ -40,3 +46,51 @@ def test_simulate_compound_requires_positive_years():
     params = CompoundParams(years=0)
     with pytest.raises(ValueError):
         simulate_compound(start, params)
+
+
+def test_simulate_compound_result_is_isolated_from_cache():
+    start = date(2024, 1, 1)
+    params = CompoundParams(years=1)
+    first = simulate_compound(start, params)
+    expected = first["value"].to_numpy().copy()
+    first["value"] *= 2
+
+    again = simulate_compound(start, params)
+    assert np.allclose(again["value"].to_numpy(), expected)
+
+
+def test_simulate_compound_float32_matches_float64():
+    start = date(2024, 1, 1)
+    params = CompoundParams(years=20)
+    ref = simulate_compound(start, params)
+    low = simulate_compound(start, params, dtype=np.float32)
+
+    assert (low.dtypes == np.float32).all()
+    for col in ("value", "contrib", "inflation_value", "real_value"):
+        rel = np.abs(low[col].to_numpy(np.float64) - ref[col].to_numpy()) / np.abs(ref[col].to_numpy())
+        assert rel.max() <= 1e-4
+
+
+def test_simulate_compound_arrays_match_dataframe():
+    start = date(2024, 1, 1)
+    params = CompoundParams(years=5)
+    df = simulate_compound(start, params)
+    sim = simulate_compound_arrays(start, params)
+
+    assert sim.index.equals(df.index)
+    for col in ("value", "contrib", "net_rate", "inflation_value", "real_value"):
+        assert np.array_equal(getattr(sim, col), df[col].to_numpy())
+    assert not sim.value.flags.writeable
+
+
+def test_compound_series_blocks_match_recurrence_for_extreme_growth():
+    # growth^n fuori dal range dei float64: forma chiusa applicata a blocchi
+    increments = np.zeros(5000)
+    increments[::30] = 300.0
+    growth = 1.2
+    expected = np.empty_like(increments)
+    _compound_kernel(1000.0, growth, increments, expected)
+    result = _compound_series(1000.0, growth, increments)
+    finite = np.isfinite(expected)
+    assert np.array_equal(np.isfinite(result), finite)
+    assert np.allclose(result[finite], expected[finite], rtol=1e-9)
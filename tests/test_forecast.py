@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from core import forecast
+from core.forecast import forecast_from_history
+
+
+def test_forecast_from_history_projects_compound_growth_per_day():
+    hist_index = pd.date_range("2015-01-01", "2020-01-01", freq="D")
+    years = np.arange(len(hist_index)) / 365.25
+    hist = pd.Series(100.0 * 1.05 ** years, index=hist_index)
+
+    future = pd.DatetimeIndex(["2019-06-01", "2021-01-01", "2025-01-01"])
+    result = forecast_from_history(hist, future, lookback_years=5)
+
+    assert result.index.equals(future)
+    last_price = float(hist.iloc[-1])
+    # Date precedenti all'ultimo prezzo restano ferme all'ultimo valore
+    assert np.isclose(result.iloc[0], last_price)
+    daily = 1.05 ** (1.0 / 365.25) - 1.0
+    for d, value in result.iloc[1:].items():
+        days = (d - hist_index[-1]).days
+        assert np.isclose(value, last_price * (1.0 + daily) ** days, rtol=1e-3)
+
+
+def test_forecast_from_history_handles_empty_inputs():
+    future = pd.DatetimeIndex(["2030-01-01"])
+    assert forecast_from_history(pd.Series(dtype=float), future).empty
+
+
+def test_fetch_adj_close_many_downloads_all_tickers_in_one_call(monkeypatch, tmp_path):
+    index = pd.date_range("2024-01-01", periods=3, freq="D")
+    columns = pd.MultiIndex.from_product([["^TNX", "^VIX"], ["Close", "Adj Close"]])
+    frame = pd.DataFrame(np.arange(12, dtype=float).reshape(3, 4), index=index, columns=columns)
+    calls = []
+
+    def fake_download(**kwargs):
+        calls.append(kwargs["tickers"])
+        return frame
+
+    monkeypatch.setattr(forecast.yf, "download", fake_download)
+    monkeypatch.setattr(forecast, "_DISK_CACHE_DIR", tmp_path)
+    forecast._cached_adj_close_many.cache_clear()
+
+    result = forecast._fetch_adj_close_many(["^TNX", "^VIX", "DX-Y.NYB"], index[0], index[-1])
+
+    assert calls == ["^TNX ^VIX DX-Y.NYB"]
+    assert list(result["^TNX"]) == [1.0, 5.0, 9.0]
+    assert list(result["^VIX"]) == [3.0, 7.0, 11.0]
+    assert result["DX-Y.NYB"].empty
+
+
+def test_fetch_adj_close_reuses_disk_cache_across_sessions(monkeypatch, tmp_path):
+    index = pd.date_range("2020-01-01", periods=3, freq="D")
+    frame = pd.DataFrame({"Close": [1.0, 2.0, 3.0], "Adj Close": [1.5, 2.5, 3.5]}, index=index)
+    calls = []
+
+    def fake_download(**kwargs):
+        calls.append(kwargs["tickers"])
+        return frame
+
+    monkeypatch.setattr(forecast.yf, "download", fake_download)
+    monkeypatch.setattr(forecast, "_DISK_CACHE_DIR", tmp_path)
+    forecast._cached_adj_close.cache_clear()
+    first = forecast._fetch_adj_close("SPY", index[0], index[-1])
+
+    # nuova "sessione": la cache in memoria è vuota, quella su disco no
+    forecast._cached_adj_close.cache_clear()
+    second = forecast._fetch_adj_close("SPY", index[0], index[-1])
+
+    assert calls == ["SPY"]
+    assert list(second) == list(first) == [1.5, 2.5, 3.5]
+    forecast._cached_adj_close.cache_clear()
+
+
+def test_disk_cache_prunes_expired_recent_ranges(monkeypatch, tmp_path):
+    monkeypatch.setattr(forecast, "_DISK_CACHE_DIR", tmp_path)
+    today = pd.Timestamp.today().date().isoformat()
+    series = pd.Series([1.0, 2.0])
+
+    forecast._disk_cache_store("ieri", series, today)
+    stale = forecast._disk_cache_path("ieri", recent=True)
+    old = stale.stat().st_mtime - forecast._RECENT_TTL_SECONDS - 60
+    os.utime(stale, (old, old))
+    forecast._disk_cache_store("chiuso", series, "2000-01-03")
+    forecast._disk_cache_store("oggi", series, today)
+
+    assert not stale.exists()
+    assert forecast._disk_cache_path("oggi", recent=True).exists()
+    assert forecast._disk_cache_path("chiuso").exists()
+    assert forecast._disk_cache_load("ieri", today) is None
+    assert list(forecast._disk_cache_load("oggi", today)) == [1.0, 2.0]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_disk_cache_range_recent_at_download_never_freezes(monkeypatch, tmp_path):
+    monkeypatch.setattr(forecast, "_DISK_CACHE_DIR", tmp_path)
+    # scaricato 200 giorni fa, quando l'intervallo finiva il giorno prima: resta soggetto al TTL
+    end = (pd.Timestamp.today() - pd.Timedelta(days=201)).date().isoformat()
+    path = forecast._disk_cache_path("vecchio", recent=True)
+    pd.to_pickle(pd.Series([1.0]), path)
+    written = (pd.Timestamp.today() - pd.Timedelta(days=200)).timestamp()
+    os.utime(path, (written, written))
+
+    assert forecast._disk_cache_load("vecchio", end) is None
@@ -89,3 +89,48 @@ def test_load_events_csv_requires_minimum_columns(tmp_path):
 
     with pytest.raises(ValueError):
         load_events_csv(str(path))
+
+
+def test_load_events_csv_tolerates_rows_with_extra_fields(tmp_path):
+    path = tmp_path / "ragged.csv"
+    path.write_text(
+        "Submission Date,Dati Personali,Eventi:\n"
+        '01/01/2024 10:00:00,"Nome: Anna, Cognome: Verdi","Titolo: Casa, Categoria: famiglia, Data: 12/12/2002"\n'
+        '02/01/2024,"Nome: Carlo, Cognome: Neri",,extra\n',
+        encoding="utf-8",
+    )
+
+    events, people = load_events_csv(str(path))
+
+    assert list(people) == ["Anna Verdi", "Carlo Neri"]
+    assert [e.titolo for e in events] == ["Casa"]
+
+
+def test_read_events_frame_reads_multiline_cells_in_one_pass(tmp_path, monkeypatch):
+    from core import io_csv
+
+    rows = [
+        {
+            COLS[0]: f"0{d}/01/2024 10:00:00",
+            COLS[1]: f"Titolo: Evento {d}, Categoria: famiglia, Data: 0{d}/02/2001\n"
+                     f"Titolo: Altro {d}, Categoria: bisogno, Data: 1{d}/03/2002",
+            COLS[2]: "",
+            COLS[3]: f"Nome: Persona{d}, Cognome: Test",
+        }
+        for d in range(1, 4)
+    ]
+    path = str(_write_csv(tmp_path, rows))
+    calls = []
+    read_csv = pd.read_csv
+
+    def spy(*args, **kwargs):
+        calls.append(kwargs)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(io_csv.pd, "read_csv", spy)
+    frame = io_csv._read_events_frame(path)
+
+    # intestazione + dati: nessuna seconda lettura di ripiego
+    assert [c.get("nrows") for c in calls] == [0, None]
+    assert all("engine" not in c for c in calls)
+    assert frame[COLS[1]].str.count("\n").tolist() == [1, 1, 1]
@@ -18,3 +18,12 @@ def test_load_table_returns_empty_dict_for_missing_file(tmp_path):
     path = tmp_path / "missing.csv"
     loader = MortalityTableLoader()
     assert loader.load_table(str(path)) == {}
+
+
+def test_load_table_accepts_multi_character_separator(tmp_path):
+    path = tmp_path / "mortality.csv"
+    path.write_text("Età || Anni residui\n65 || 20\n70 || 15,5\n", encoding="utf-8")
+
+    table = MortalityTableLoader(sep="||").load_table(str(path))
+
+    assert table == {65: 20, 70: 15}
@@ -1,9 +1,14 @@
 from datetime import datetime
 
+import pandas as pd
+
 from core.parsing import (
     parse_date,
+    parse_dates,
+    parse_eventi_column,
     parse_eventi_field,
     parse_personal_details,
+    parse_personal_details_column,
 )
 
 
@@ -44,6 +49,12 @@ def test_parse_eventi_field_forces_default_dependent_flag():
     assert ev["Familiare"] == ""
 
 
+def test_parse_eventi_field_drops_unrecognised_lines():
+    # righe fuori dai formati noti restano scartate (comportamento storico del parser flessibile)
+    assert parse_eventi_field("Categoria: sogni, Titolo Evento: Viaggio, Data Evento: 03/04/2020") == []
+    assert parse_eventi_field("Titolo: Auto, nuova, Categoria: acquisto, Data: 09/04/5") == []
+
+
 def test_parse_date_supports_multiple_unambiguous_formats():
     assert parse_date("2024-01-05") == datetime(2024, 1, 5)
     assert parse_date("05/06/2024") == datetime(2024, 6, 5)
@@ -59,3 +70,47 @@ def test_parse_personal_details_extracts_full_payload():
     assert result["cognome"] == "Rossi"
     assert result["sesso"] == "Maschio"
     assert result["nascita_str"] == "18-11-1970"
+
+
+def test_parse_personal_details_column_matches_scalar_parser():
+    values = pd.Series([
+        "Nome: Anna , Cognome: Bianchi, Sesso: Femmina, Data Di Nascita: 01-02-1985",
+        "nome: Mario, cognome: Rossi",
+        "Sesso: Maschio",
+        "",
+    ])
+    details = parse_personal_details_column(values)
+
+    assert details.to_dict("records") == [parse_personal_details(v) for v in values]
+
+
+def test_parse_eventi_column_matches_scalar_parser():
+    texts = [
+        "Titolo Evento: Laurea, Categoria: Progetto, Data Evento: 11-09-1999, Costo: 1500, "
+        "A Carico?: Si, Nome del Familiare A Carico: Carlo\n"
+        "Titolo: Casa nuova, Categoria: sogni, Data: 05/07/2005",
+        "",
+        "Titolo Evento: Auto, Categoria: bisogno, Data Evento: 01-02-2010, Nome del Familiare: Anna",
+        "Categoria: progetto, Titolo: Viaggio, Data: 03/04/2020",
+    ]
+    defaults = [False, False, True, False]
+    parsed = parse_eventi_column(pd.Series(texts), defaults)
+
+    expected = [
+        (row, ev["Titolo"], ev["Categoria"], ev["DataEvento"], ev["Familiare"], ev["Acarico"], ev["Costo"])
+        for row, (text, dep) in enumerate(zip(texts, defaults))
+        for ev in parse_eventi_field(text, default_is_dependent=dep)
+    ]
+    got = [
+        (int(row), titolo, cat, data, fam, bool(dep), costo)
+        for row, titolo, cat, data, fam, dep, costo in parsed.itertuples(index=False)
+    ]
+    assert got == expected
+
+
+def test_parse_dates_matches_scalar_parser():
+    values = [
+        "2024-02-29", "31/12/2023", "06-20-2028", "05/07/05", "31-02-2020",
+        "13/13/2013", "1/2", "", "abc", " 01-01-2000 ",
+    ]
+    assert parse_dates(values) == [parse_date(v) for v in values]
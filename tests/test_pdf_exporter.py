@@ -13,3 +13,8 @@ def test_default_pdf_filename_handles_missing_person():
     today = date(2024, 9, 1)
     assert default_pdf_filename("", today=today) == "timeline_01-09-2024.pdf"
     assert default_pdf_filename("Rossi", today=today) == "rossi_timeline_01-09-2024.pdf"
+
+
+def test_default_pdf_filename_cache_follows_date():
+    assert default_pdf_filename("Ale Rossi", today=date(2024, 9, 1)) == "rossi_ale_timeline_01-09-2024.pdf"
+    assert default_pdf_filename("Ale Rossi", today=date(2024, 9, 2)) == "rossi_ale_timeline_02-09-2024.pdf"
@@ -3,6 +3,10 @@ from __future__ import annotations
 
 from typing import Iterable, Dict, Optional, Tuple, List, Any
 from datetime import datetime, date
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+import math
 
 import numpy as np
 import pandas as pd
@@ -10,14 +14,71 @@ import matplotlib.dates as mdates
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.ticker import FuncFormatter
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox, ScaledTranslation
+from matplotlib import patheffects
 
-from PyQt6.QtCore import Qt, QEvent, QDate
+from PyQt6.QtCore import Qt, QEvent, QDate, QTimer
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QSizePolicy, QScrollArea,
     QFormLayout, QDoubleSpinBox, QSpinBox, QHBoxLayout, QPushButton, QDateEdit
 )
 
-from core.compounding import simulate_compound, CompoundParams
+from core.compounding import simulate_compound_arrays, CompoundParams, CompoundSeries
+
+
+# separatori all'italiana: migliaia "." e decimali "," in un solo passaggio
+_EUR_TAB = str.maketrans(",.", ".,")
+
+_CONTRIB_COLOR = "#60a5fa"
+
+
+@lru_cache(maxsize=256)
+def _eur_tick_label(y: float) -> str:
+    """Etichetta dei tick dell'asse y: tra un ridisegno e l'altro i valori sono quasi sempre gli stessi."""
+    return f"€ {y:,.0f}".translate(_EUR_TAB)
+
+
+# area (pt^2) dei pallini evento
+_EVENT_MARKER_SIZE = 56
+
+
+def _group_events(points: List[Tuple[date, str]]) -> Tuple[pd.DatetimeIndex, List[str]]:
+    """Eventi (ordinati per data) raggruppati per giorno: un titolo "a; b" per data, "(senza titolo)" se vuoti."""
+    dates: List[date] = []
+    titles: List[str] = []
+    for d, group in groupby(points, key=itemgetter(0)):
+        dates.append(d)
+        titles.append("; ".join([t for t in (name.strip() for _, name in group) if t]) or "(senza titolo)")
+    return pd.to_datetime(dates), titles
+
+
+def _nearest_index(x: np.ndarray, grid: Optional[Tuple[float, float]], value: float) -> int:
+    """Indice del punto di x (crescente, non vuoto) più vicino a value; a pari distanza quello a sinistra.
+    Solo aritmetica su float Python: è il percorso caldo dell'hover."""
+    n = len(x)
+    if grid is not None:
+        # griglia regolare: indice diretto
+        x0, dx = grid
+        return min(max(math.ceil((value - x0) / dx - 0.5), 0), n - 1)
+    hi = int(x.searchsorted(value))
+    if hi <= 0:
+        return 0
+    if hi >= n:
+        return n - 1
+    lo = hi - 1
+    return hi if float(x[hi]) - value < value - float(x[lo]) else lo
+
+
+def _uniform_grid(x: np.ndarray) -> Optional[Tuple[float, float]]:
+    """(x0, passo) se i punti sono equispaziati (la simulazione è giornaliera), altrimenti None."""
+    if len(x) < 2:
+        return None
+    x0 = float(x[0])
+    dx = (float(x[-1]) - x0) / (len(x) - 1)
+    if dx <= 0 or not np.allclose(np.diff(x), dx):
+        return None
+    return x0, dx
 
 
 class CompoundInterestWidget(QWidget):
@@ -28,10 +89,13 @@ class CompoundInterestWidget(QWidget):
 
         self._start_dt: Optional[datetime] = None
         self._event_points: List[Tuple[date, str]] = []  # (data, titolo)
+        # eventi raggruppati per giorno (date, titoli uniti), calcolati una volta in set_event_points
+        self._event_groups: Tuple[pd.DatetimeIndex, List[str]] = _group_events([])
         self._suppress_start_signal = False
 
         # ---- Titolo
         self.title = QLabel("Calcolatore interesse composto")
+        self.title.setTextFormat(Qt.TextFormat.PlainText)
         self.title.setStyleSheet("color:#111; font-weight:600; margin: 4px 0;")
         self.title.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
 
@@ -89,6 +153,8 @@ class CompoundInterestWidget(QWidget):
 
         # ---- Status
         self.status = QLabel("")
+        # testo semplice: a ogni ricalcolo niente rilevamento del rich text
+        self.status.setTextFormat(Qt.TextFormat.PlainText)
         self.status.setStyleSheet("color:#6b7280; font-size:12px;")
         self.status.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
 
@@ -101,16 +167,45 @@ class CompoundInterestWidget(QWidget):
         root.addWidget(self.status)
 
         # Signals
-        self.btn_calc.clicked.connect(self.recompute)
+        self.btn_calc.clicked.connect(self._do_recompute)
         for w in (self.spin_initial, self.spin_monthly, self.spin_rate,
                   self.spin_mgmt, self.spin_inflation, self.spin_years):
             w.valueChanged.connect(self.recompute)
         self.start_date_edit.dateChanged.connect(self._on_start_date_changed)
 
+        # ricalcolo differito: più modifiche ravvicinate (frecce delle spinbox, set_* in sequenza)
+        # producono un solo ricalcolo con i valori finali
+        self._recompute_timer = QTimer(self)
+        self._recompute_timer.setSingleShot(True)
+        self._recompute_timer.setInterval(80)
+        self._recompute_timer.timeout.connect(self._do_recompute)
+        self._dirty = False  # ricalcolo saltato mentre il widget era nascosto
+        self._cached_scroll: Optional[QScrollArea] = None  # QScrollArea antenato, trovato al primo wheel
+
         # Hover state
         self._scatter = None                 # punti evento (matplotlib PathCollection)
         self._hover_cid = self.canvas.mpl_connect("motion_notify_event", self._on_hover)
+        # hover a ~60 Hz: gli eventi mouse intermedi si fondono nell'ultimo ricevuto
+        self._pending_hover = None
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(16)
+        self._hover_timer.timeout.connect(self._do_hover)
+        # sfondo del grafico senza tooltip/marker (animated): l'hover ridisegna solo quelli
+        self._hover_bg = None
+        self._hover_extents: List[Bbox] = []  # riquadri (pixel) di tooltip/marker nell'ultimo blit
+        # punto mostrato dal tooltip: ("event", i) o (serie, indice); None se nascosto
+        self._hover_target: Optional[Tuple] = None
         self._draw_cid = self.canvas.mpl_connect("draw_event", self._on_draw_event)
+        self._resize_cid = self.canvas.mpl_connect("resize_event", self._on_resize)
+
+        # linee disegnate (sottocampionate) con le rispettive serie complete, per ricampionare al resize
+        self._plot_x: Optional[np.ndarray] = None  # x complete (giorni matplotlib), comuni a tutte le serie
+        self._x_grid: Optional[Tuple[float, float]] = None  # (x0, passo) di _plot_x se equispaziate
+        self._plot_lines: List[Tuple[Any, np.ndarray]] = []
+        self._plot_len = 0
+        self._contrib_fill = None
+        self._lines: Dict[str, Any] = {}  # chiave serie -> Line2D (creati una volta in _build_axes)
 
         self._series_data: Dict[str, Dict] = {}
         self._series_by_axis: Dict = {}
@@ -119,8 +214,22 @@ class CompoundInterestWidget(QWidget):
         self._value_ax = None
         self._event_annot_key: Optional[str] = None
 
-        self._ev_points_xy: List[Tuple[datetime, float, str]] = []  # (dt, value, title)
-        self._event_label_artists: List[Tuple[Any, float]] = []
+        self._ev_points_xy: List[Tuple[str, float, str]] = []  # (data YYYY-MM-DD, value, title)
+        # pallini evento in coordinate dati (N x 2) e, dopo il primo hover, in pixel:
+        # le date sono ordinate, quindi anche le x in pixel e la ricerca è per bisezione
+        self._ev_data_xy: Optional[np.ndarray] = None
+        self._ev_val_str: List[str] = []  # valori degli eventi già formattati per il tooltip
+        self._ev_px: Optional[np.ndarray] = None
+        self._event_label_artists: List[Tuple[Any, float, float]] = []  # (Text, x, y) in coordinate dati
+        self._event_label_pool: List[Text] = []  # tutti i Text creati per le etichette, anche quelli nascosti
+        self._event_label_halo = [patheffects.withStroke(linewidth=3, foreground="white", alpha=0.85)]
+        self._event_label_transforms: Dict[str, Any] = {}  # ha -> transData + offset dell'etichetta
+        # date (YYYY-MM-DD) dell'ultima simulazione, formattate in blocco a ogni ricalcolo:
+        # l'hover indicizza qui invece di passare da num2date/strftime
+        self._date_strs: List[str] = []
+        # (data di partenza, parametri, eventi) dell'ultimo grafico completato
+        self._rendered_key: Optional[Tuple] = None
+        self._sim: Optional[CompoundSeries] = None  # simulazione mostrata, riusata se cambiano solo gli eventi
 
     # ---------- Public API ----------
     def set_start_date(self, dt: Optional[datetime]) -> None:
@@ -133,6 +242,7 @@ class CompoundInterestWidget(QWidget):
         self._event_points = sorted(
             [(p[0].date() if isinstance(p[0], datetime) else p[0], str(p[1])) for p in points]
         )
+        self._event_groups = _group_events(self._event_points)
         self._sync_start_date_edit()
         self.recompute()
 
@@ -191,8 +301,12 @@ class CompoundInterestWidget(QWidget):
             self._suppress_start_signal = False
 
     def _fmt_eur(self, v: float, decimals: int = 2) -> str:
-        s = f"{v:,.{decimals}f}"
-        return "€ " + s.replace(",", "X").replace(".", ",").replace("X", ".")
+        return f"€ {v:,.{decimals}f}".translate(_EUR_TAB)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._dirty:
+            self._do_recompute()
 
     def eventFilter(self, obj, event):
         # Nessuno zoom: inoltra SEMPRE lo scroll al contenitore scrollabile
@@ -205,10 +319,21 @@ class CompoundInterestWidget(QWidget):
         return super().eventFilter(obj, event)
 
     def _find_scroll_area(self) -> QScrollArea | None:
+        # risalita dei parent solo al primo wheel: il risultato resta valido fino al prossimo reparent
+        if self._cached_scroll is not None:
+            return self._cached_scroll
         w = self.parent()
         while w is not None and not isinstance(w, QScrollArea):
             w = w.parent()
-        return w if isinstance(w, QScrollArea) else None
+        if isinstance(w, QScrollArea):
+            self._cached_scroll = w
+            return w
+        return None
+
+    def event(self, event):
+        if event.type() == QEvent.Type.ParentChange:
+            self._cached_scroll = None
+        return super().event(event)
 
     def _params(self) -> CompoundParams:
         return CompoundParams(
@@ -221,68 +346,88 @@ class CompoundInterestWidget(QWidget):
         )
 
     def recompute(self) -> None:
-        self.fig.clear()
+        self._recompute_timer.start()
+
+    def _do_recompute(self) -> None:
+        self._recompute_timer.stop()
+        # widget non visibile (finestra non ancora mostrata, scheda nascosta): si rimanda a showEvent
+        if not self.isVisible():
+            self._dirty = True
+            return
+        self._dirty = False
+        # stessi input dell'ultimo grafico (es. spinbox avanti e indietro, set_* ripetuti): niente da rifare
+        start_d = self._start_dt.date() if self._start_dt is not None else None
+        p = self._params()
+        key = (start_d, p, tuple(self._event_points))
+        if key == self._rendered_key:
+            return
+        # stessa simulazione (es. cambio persona con la stessa data di partenza): si rifanno solo gli eventi
+        events_only = self._rendered_key is not None and self._rendered_key[:2] == key[:2]
+        self._rendered_key = None
+
+        self._hover_bg = None
+        self._hide_hover()
+        self._clear_events()
+        if events_only:
+            self._plot_events()
+            self._finish_plot()
+            self._rendered_key = key
+            return
+
+        self._plot_x = None
+        self._sim = None
         self._series_data.clear()
-        self._series_by_axis.clear()
-        self._markers.clear()
-        self._annots.clear()
-        self._scatter = None
-        self._value_ax = None
-        self._event_annot_key = None
-        self._event_label_artists.clear()
 
         if self._start_dt is None:
             if self._event_points:
                 self.status.setText("Scegli una data di partenza per avviare la simulazione.")
             else:
                 self.status.setText("Seleziona una persona con almeno un evento per generare la simulazione.")
-            self.canvas.draw_idle(); return
+            self._show_empty(); return
 
-        start_d = self._start_dt.date()
-        p = self._params()
         try:
-            df = simulate_compound(start_d, p)
+            sim = simulate_compound_arrays(start_d, p)
         except Exception as e:
             self.status.setText(f"Errore parametri: {e}")
-            self.canvas.draw_idle(); return
+            self._show_empty(); return
 
-        if df.empty:
+        if len(sim.index) == 0:
             self.status.setText("Nessun dato generato per questi parametri.")
-            self.canvas.draw_idle(); return
-
-        x_dates = df.index
-        x_num = mdates.date2num(x_dates.to_pydatetime())
+            self._show_empty(); return
 
-        ax = self.fig.add_subplot(111)
-
-        def _style_axis(axis):
-            axis.set_facecolor("#fcfcfd")
-            for side in ("top", "right"):
-                axis.spines[side].set_visible(False)
-            for side in ("left", "bottom"):
-                axis.spines[side].set_color("#e5e7eb")
-            axis.grid(True, which="major", alpha=0.28, linestyle="--", linewidth=0.8)
-            axis.tick_params(axis="both", labelsize=10)
-            axis.yaxis.set_major_formatter(FuncFormatter(lambda y, _pos: self._fmt_eur(y, 0)))
-            axis.margins(x=0.02)
+        self._sim = sim
+        x_dates = sim.index
+        # date -> numeri matplotlib una volta sola, direttamente dal datetime64 (niente oggetti datetime);
+        # linee e area ricevono già x numeriche sull'asse date
+        x_num = mdates.date2num(x_dates.values)
+        self._date_strs = x_dates.strftime("%Y-%m-%d").tolist()
+        x_grid = _uniform_grid(x_num)
 
-        _style_axis(ax)
+        # assi e artisti sono creati una volta sola: qui si aggiornano solo i dati
+        ax = self._value_ax
+        if ax is None:
+            ax = self._build_axes()
+        ax.set_visible(True)
 
         # --- Valore portafoglio, inflazione e contributi nello stesso grafico ---
-        value_color = "#2563eb"
-        val_series = df["value"].values.astype(float)
-        line_val, = ax.plot(x_dates, val_series, linewidth=2.2, color=value_color, label="Valore portafoglio")
-
-        infl_color = "#f97316"
-        infl_series = df["inflation_value"].values.astype(float)
-        line_infl, = ax.plot(x_dates, infl_series, linewidth=2.0, linestyle="--", color=infl_color,
-                              label="Valore con inflazione")
-
-        area_color = "#60a5fa"
-        contrib_vals = df["contrib"].values.astype(float)
-        ax.fill_between(x_dates, contrib_vals, step="pre", alpha=0.18, color=area_color)
-        line_contrib, = ax.plot(x_dates, contrib_vals, linewidth=1.8, color=area_color,
-                                 label="Contributi cumulati")
+        # si disegna un sottoinsieme dei punti giornalieri (~2 per pixel); l'hover usa le serie complete
+        plot_idx = self._plot_indices(len(x_num))
+        x_plot = x_num[plot_idx]
+
+        val_series = sim.value
+        infl_series = sim.inflation_value
+        contrib_vals = sim.contrib
+        self._plot_lines = [
+            (self._lines["value"], val_series),
+            (self._lines["inflation"], infl_series),
+            (self._lines["contrib"], contrib_vals),
+        ]
+        for line, values in self._plot_lines:
+            line.set_data(x_plot, values[plot_idx])
+        self._set_contrib_fill(x_plot, contrib_vals[plot_idx])
+        self._plot_x = x_num
+        self._x_grid = x_grid
+        self._plot_len = len(plot_idx)
 
         ymax = float(np.nanmax([
             np.nanmax(val_series),
@@ -302,12 +447,115 @@ class CompoundInterestWidget(QWidget):
         ymin_adj = ymin - span * 0.04
         ymax_adj = ymax + span * 0.18
         ax.set_ylim(ymin_adj, ymax_adj)
+
+        for series_key, series_values, label in (
+            ("value", val_series, "Valore portafoglio"),
+            ("inflation", infl_series, "Valore con inflazione"),
+            ("contrib", contrib_vals, "Contributi cumulati"),
+        ):
+            self._series_data[series_key] = {
+                "axis": ax,
+                "y": series_values,
+                "label": label,
+                "fmt": self._fmt_eur,
+                "tips": {},  # indice -> testo completo del tooltip, riempito dall'hover
+            }
+
+        self._plot_events()
+        self._finish_plot()
+
+        self.status.setText(
+            f"Start: {start_d.isoformat()} | Tasso annuo: {p.annual_rate*100:.2f}% | "
+            f"Gestione: {p.mgmt_fee_annual*100:.2f}% | Inflazione: {p.inflation_rate*100:.2f}% | "
+            "Versamento: ogni 1° del mese"
+        )
+        self._rendered_key = key
+
+    def _clear_events(self) -> None:
+        self._ev_points_xy = []
+        self._scatter_set_events(None)
+        # le etichette restano negli assi, nascoste: _plot_events le riusa
+        for label, _, _ in self._event_label_artists:
+            label.set_visible(False)
+        self._event_label_artists.clear()
+
+    def _plot_events(self) -> None:
+        """Pallini ed etichette degli eventi sulla simulazione corrente."""
+        if not self._event_points or self._sim is None:
+            return
+        ev_idx, titles = self._event_groups
+        # valore all'ultimo giorno simulato <= data evento (NaN se l'evento precede la partenza):
+        # una ricerca binaria per evento invece di reindex + ffill dell'intera serie
+        pos = self._sim.index.searchsorted(ev_idx, side="right") - 1
+        ev_values = np.where(pos >= 0, self._sim.value[np.maximum(pos, 0)], np.nan)
+        # date già come testo per il tooltip, direttamente dal datetime64 (niente oggetti datetime)
+        ev_dates = np.datetime_as_string(ev_idx.values, unit="D").tolist()
+        self._ev_points_xy = list(zip(ev_dates, ev_values, titles))
+        fmt = self._fmt_eur
+        self._ev_val_str = [fmt(v) for v in ev_values.tolist()]
+
+        self._scatter_set_events(np.column_stack((mdates.date2num(ev_idx.values), ev_values)))
+        # etichette come semplici Text: spostamento (in punti) e alone bianco condivisi da tutte,
+        # invece di un'Annotation con il suo riquadro per ciascun evento.
+        # I Text già creati si riusano (posizione e testo); se ne aggiungono solo se gli eventi sono di più
+        pool = self._event_label_pool
+        for dt_num, val, title in zip(self._ev_data_xy[:, 0].tolist(), self._ev_data_xy[:, 1].tolist(), titles):
+            # evento prima della partenza (valore NaN): nessun pallino, quindi nessuna etichetta
+            if not math.isfinite(val):
+                continue
+            n = len(self._event_label_artists)
+            if n < len(pool):
+                label = pool[n]
+                label.set_position((dt_num, val))
+                label.set_text(title)
+                label.set_visible(True)
+            else:
+                label = self._value_ax.text(
+                    dt_num, val, title,
+                    transform=self._event_label_transforms["center"],
+                    fontsize=8, color="#334155",
+                    ha="center", va="bottom",
+                    path_effects=self._event_label_halo,
+                    clip_on=False, zorder=6,
+                )
+                pool.append(label)
+            self._event_label_artists.append((label, dt_num, val))
+
+    def _finish_plot(self) -> None:
+        ax = self._value_ax
+        # limiti x dai dati correnti (linee, area e pallini), come per un grafico appena creato
+        ax.relim()
+        ax.autoscale_view(scaley=False)
+        self._update_event_label_positions()
+        self.canvas.draw_idle()
+
+    def _build_axes(self):
+        """Crea assi, linee, legenda, tooltip, marker e pallini evento (vuoti): recompute aggiorna solo i dati."""
+        ax = self.fig.add_subplot(111)
+        ax.xaxis_date()
+
+        ax.set_facecolor("#fcfcfd")
+        for side in ("top", "right"):
+            ax.spines[side].set_visible(False)
+        for side in ("left", "bottom"):
+            ax.spines[side].set_color("#e5e7eb")
+        ax.grid(True, which="major", alpha=0.28, linestyle="--", linewidth=0.8)
+        ax.tick_params(axis="both", labelsize=10)
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _pos: _eur_tick_label(y)))
+        ax.margins(x=0.02)
+
+        value_color = "#2563eb"
+        line_val, = ax.plot([], [], linewidth=2.2, color=value_color, label="Valore portafoglio")
+        line_infl, = ax.plot([], [], linewidth=2.0, linestyle="--", color="#f97316",
+                             label="Valore con inflazione")
+        line_contrib, = ax.plot([], [], linewidth=1.8, color=_CONTRIB_COLOR, label="Contributi cumulati")
+        self._lines = {"value": line_val, "inflation": line_infl, "contrib": line_contrib}
+
         ax.set_ylabel("Valore (€)")
         ax.set_xlabel("Tempo")
         ax.legend(frameon=False, loc="upper left", fontsize=10)
 
-        def _register_series(key: str, line, series_values: np.ndarray, label: str):
-            marker_color = line.get_color()
+        for key, line in self._lines.items():
             annot = ax.annotate(
                 "", xy=(0, 0), xytext=(-8, 12), textcoords="offset points",
                 bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#cbd5e1", lw=0.8, alpha=0.97),
@@ -315,96 +563,86 @@ class CompoundInterestWidget(QWidget):
                 ha="right"
             )
             annot.set_visible(False)
-            marker, = ax.plot([], [], marker="o", markersize=5, color=marker_color, zorder=5)
-            self._series_data[key] = {
-                "axis": ax,
-                "x": x_num,
-                "y": series_values,
-                "label": label,
-                "fmt": self._fmt_eur,
-            }
-            self._series_by_axis.setdefault(ax, []).append(key)
+            # fuori dal layout: il tooltip non deve spostare gli assi
+            annot.set_in_layout(False)
+            annot.set_animated(True)
+            marker, = ax.plot([], [], marker="o", markersize=5, color=line.get_color(), zorder=5, animated=True)
             self._annots[key] = annot
             self._markers[key] = marker
-
-        _register_series("value", line_val, val_series, "Valore portafoglio")
-        _register_series("inflation", line_infl, infl_series, "Valore con inflazione")
-        _register_series("contrib", line_contrib, contrib_vals, "Contributi cumulati")
-
+        self._series_by_axis[ax] = list(self._lines)
+
+        self._scatter = ax.scatter(
+            [], [],
+            s=_EVENT_MARKER_SIZE, zorder=4,
+            edgecolor="#0f172a", linewidths=0.7,
+            facecolor=value_color,
+            label="_nolegend_",
+        )
+        self._event_label_transforms = {
+            ha: ax.transData + ScaledTranslation(dx / 72, 8 / 72, self.fig.dpi_scale_trans)
+            for ha, dx in (("left", 6), ("right", -6), ("center", 0))
+        }
         self._value_ax = ax
         self._event_annot_key = "value"
+        return ax
+
+    def _scatter_set_events(self, xy: Optional[np.ndarray]) -> None:
+        """Pallini evento in coordinate dati (N x 2), None per nessun evento."""
+        self._ev_data_xy = xy
+        self._ev_px = None
+        if self._scatter is not None:
+            self._scatter.set_offsets(np.empty((0, 2)) if xy is None else xy)
+
+    def _hide_hover(self) -> None:
+        self._hover_target = None
+        for annot in self._annots.values():
+            annot.set_visible(False)
+        for marker in self._markers.values():
+            marker.set_data([], [])
 
-        # --- pallini + etichette evento sul grafico principale ---
-        self._ev_points_xy = []
-        if self._event_points:
-            ev_map: Dict[pd.Timestamp, List[str]] = {}
-            for d, name in self._event_points:
-                ts = pd.Timestamp(d)
-                ev_map.setdefault(ts, []).append(name.strip())
-
-            ev_idx = pd.to_datetime(sorted(ev_map.keys()))
-            aligned = df.reindex(df.index.union(ev_idx)).ffill().loc[ev_idx]
-            titles = ["; ".join([t for t in ev_map[ts] if t] or ["(senza titolo)"]) for ts in ev_idx]
-            self._ev_points_xy = list(zip(aligned.index.to_pydatetime(), aligned["value"].values, titles))
-
-            self._scatter = ax.scatter(
-                aligned.index, aligned["value"].values,
-                s=56, zorder=4,
-                edgecolor="#0f172a", linewidths=0.7,
-                facecolor=line_val.get_color(),
-                label="_nolegend_",
-            )
-            for (dt, val, title) in self._ev_points_xy:
-                dt_num = mdates.date2num(dt)
-                annot = ax.annotate(
-                    title, xy=(dt_num, val),
-                    xytext=(0, 8), textcoords="offset points",
-                    fontsize=8, color="#334155",
-                    ha="center", va="bottom",
-                    bbox=dict(boxstyle="round,pad=0.18", fc="white", ec="none", alpha=0.85),
-                    clip_on=False
-                )
-                annot.set_zorder(6)
-                self._event_label_artists.append((annot, dt_num))
-
-            self._update_event_label_positions()
+    def _clear_hover(self) -> None:
+        if self._hover_target is None:
+            return
+        self._hide_hover()
+        self._blit_hover()
 
+    def _show_empty(self) -> None:
+        # nessuna simulazione: figura vuota, come dopo un fig.clear()
+        if self._value_ax is not None:
+            self._value_ax.set_visible(False)
         self.canvas.draw_idle()
 
-        self.status.setText(
-            f"Start: {start_d.isoformat()} | Tasso annuo: {p.annual_rate*100:.2f}% | "
-            f"Gestione: {p.mgmt_fee_annual*100:.2f}% | Inflazione: {p.inflation_rate*100:.2f}% | "
-            "Versamento: ogni 1° del mese"
-        )
-
     def _on_hover(self, event):
+        self._pending_hover = event
+        if not self._hover_timer.isActive():
+            self._hover_timer.start()
+
+    def _do_hover(self) -> None:
         """Tooltip sugli eventi (se sopra un pallino) oppure sulle linee dei tre grafici."""
+        event, self._pending_hover = self._pending_hover, None
+        if event is None:
+            return
         # Se fuori dagli assi, spegni tutto
         if event.inaxes is None:
-            updated = False
-            for annot in self._annots.values():
-                if annot.get_visible():
-                    annot.set_visible(False)
-                    updated = True
-            for marker in self._markers.values():
-                marker.set_data([], [])
-            if updated:
-                self.canvas.draw_idle()
+            self._clear_hover()
             return
 
         ax = event.inaxes
 
         # 1) Se il mouse è su un pallino evento nel grafico principale
         if ax is self._value_ax and self._scatter is not None:
-            contains, ind = self._scatter.contains(event)
-            if contains and ind.get("ind"):
-                i = ind["ind"][0]
-                dt, val, title = self._ev_points_xy[i]
-                dt_num = mdates.date2num(dt)
+            i = self._event_at(event.x, event.y)
+            if i is not None:
+                # stesso pallino del passaggio precedente: tooltip già giusto, niente set_text né blit
+                if self._hover_target == ("event", i):
+                    return
+                self._hover_target = ("event", i)
+                date_str, val, title = self._ev_points_xy[i]
+                dt_num = float(self._ev_data_xy[i, 0])
                 annot = self._annots.get(self._event_annot_key)
                 if annot is not None:
                     annot.xy = (dt_num, float(val))
-                    annot.set_text(f"{title}\n{dt:%Y-%m-%d}  •  {self._fmt_eur(val)}")
+                    annot.set_text(f"{title}\n{date_str}  •  {self._ev_val_str[i]}")
                     annot.set_visible(True)
                 for key, marker in self._markers.items():
                     marker.set_data([], [])
@@ -412,67 +650,52 @@ class CompoundInterestWidget(QWidget):
                         other_annot = self._annots.get(key)
                         if other_annot and other_annot.get_visible():
                             other_annot.set_visible(False)
-                self.canvas.draw_idle()
+                self._blit_hover()
                 return
 
         keys = self._series_by_axis.get(ax, [])
-        if not keys or event.xdata is None:
-            for key in keys:
-                annot = self._annots.get(key)
-                marker = self._markers.get(key)
-                if annot and annot.get_visible():
-                    annot.set_visible(False)
-                if marker:
-                    marker.set_data([], [])
-            self.canvas.draw_idle()
+        x_arr = self._plot_x
+        if not keys or event.xdata is None or x_arr is None or len(x_arr) == 0:
+            self._clear_hover()
             return
 
+        # le serie condividono le x: il punto più vicino si cerca una volta sola
+        nearest = _nearest_index(x_arr, self._x_grid, float(event.xdata))
         best = None
         for key in keys:
             data = self._series_data.get(key)
             if data is None:
                 continue
-            x_arr = data["x"]
-            x = float(event.xdata)
-            if len(x_arr) == 0:
-                continue
-            if len(x_arr) == 1:
-                nearest = 0
-            else:
-                idx = int(np.clip(np.searchsorted(x_arr, x), 1, len(x_arr) - 1))
-                left = idx - 1
-                nearest = idx if abs(x_arr[idx] - x) < abs(x - x_arr[left]) else left
-            dt_num = x_arr[nearest]
             val = float(data["y"][nearest])
             diff = abs(val - float(event.ydata)) if event.ydata is not None else 0.0
-            candidate = (diff, key, dt_num, val)
+            candidate = (diff, key, val)
             if best is None or diff < best[0]:
                 best = candidate
             if event.ydata is None:
                 break
 
         if best is None:
-            for key in keys:
-                annot = self._annots.get(key)
-                marker = self._markers.get(key)
-                if annot and annot.get_visible():
-                    annot.set_visible(False)
-                if marker:
-                    marker.set_data([], [])
-            self.canvas.draw_idle()
+            self._clear_hover()
             return
 
-        _, sel_key, dt_num, val = best
+        _, sel_key, val = best
         data = self._series_data[sel_key]
         annot = self._annots.get(sel_key)
         marker = self._markers.get(sel_key)
         if annot is None or marker is None:
             return
-
+        if self._hover_target == (sel_key, nearest):
+            return
+        self._hover_target = (sel_key, nearest)
+
+        dt_num = x_arr[nearest]
+        # testo costruito una volta per punto: i passaggi successivi sono una lookup
+        tips = data["tips"]
+        text = tips.get(nearest)
+        if text is None:
+            text = tips[nearest] = f"{data['label']}\n{self._date_strs[nearest]}  •  {data['fmt'](val)}"
         annot.xy = (dt_num, val)
-        annot.set_text(
-            f"{data['label']}\n{mdates.num2date(dt_num):%Y-%m-%d}  •  {data['fmt'](val)}"
-        )
+        annot.set_text(text)
         annot.set_visible(True)
         marker.set_data([dt_num], [val])
 
@@ -484,23 +707,117 @@ class CompoundInterestWidget(QWidget):
             if other_annot and other_annot.get_visible():
                 other_annot.set_visible(False)
 
-        self.canvas.draw_idle()
+        self._blit_hover()
+
+    def _event_at(self, x: float, y: float) -> Optional[int]:
+        """Indice del pallino evento sotto il punto (pixel), il più vicino se sovrapposti."""
+        if self._ev_data_xy is None or self._value_ax is None:
+            return None
+        if self._ev_px is None:
+            # eventi prima della partenza hanno valore NaN: distanza infinita, mai colpiti
+            self._ev_px = np.nan_to_num(self._value_ax.transData.transform(self._ev_data_xy), nan=np.inf)
+        # raggio del marker più la tolleranza di pick di matplotlib (5 px)
+        radius = np.sqrt(_EVENT_MARKER_SIZE) / 2 * self.fig.dpi / 72 + 5
+        lo, hi = np.searchsorted(self._ev_px[:, 0], (x - radius, x + radius))
+        if lo == hi:
+            return None
+        d2 = ((self._ev_px[lo:hi] - (x, y)) ** 2).sum(axis=1)
+        i = int(d2.argmin())
+        return int(lo) + i if d2[i] <= radius * radius else None
 
     def _update_event_label_positions(self) -> None:
         if not self._event_label_artists or self._value_ax is None:
             return
         ax = self._value_ax
         x_left, x_right = ax.get_xlim()
+        y_low, y_high = ax.get_ylim()
         x_range = max(x_right - x_left, 1e-6)
-        for annot, dt_num in self._event_label_artists:
+        transforms = self._event_label_transforms
+        for label, dt_num, val in self._event_label_artists:
+            # fuori dai limiti correnti: l'etichetta non viene né impaginata né disegnata
+            in_view = x_left <= dt_num <= x_right and y_low <= val <= y_high
+            label.set_visible(in_view)
+            if not in_view:
+                continue
             if dt_num - x_left < 0.05 * x_range:
-                ha = "left"; dx = 6
+                ha = "left"
             elif x_right - dt_num < 0.05 * x_range:
-                ha = "right"; dx = -6
+                ha = "right"
             else:
-                ha = "center"; dx = 0
-            annot.set_ha(ha)
-            annot.xyann = (dx, 8)
+                ha = "center"
+            label.set_ha(ha)
+            label.set_transform(transforms[ha])
+
+    def _draw_hover_artists(self) -> List[Bbox]:
+        """Disegna tooltip e marker visibili; ritorna i riquadri (pixel) che occupano."""
+        renderer = self.canvas.get_renderer()
+        extents = []
+        for artist in (*self._markers.values(), *self._annots.values()):
+            if artist.get_visible():
+                self.fig.draw_artist(artist)
+                extents.append(artist.get_window_extent(renderer))
+                patch = artist.get_bbox_patch() if isinstance(artist, Text) else None
+                if patch is not None:
+                    extents.append(patch.get_window_extent(renderer))
+        return extents
+
+    def _blit_hover(self) -> None:
+        """Ripristina lo sfondo in cache, ridisegna solo tooltip e marker e
+        ricopia a schermo solo la zona cambiata (vecchia e nuova posizione)."""
+        if self._hover_bg is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._hover_bg)
+        extents = self._draw_hover_artists()
+        changed = self._hover_extents + extents
+        self._hover_extents = extents
+        if not changed:
+            return
+        dirty = Bbox.intersection(Bbox.union(changed).padded(2), self.fig.bbox)
+        if dirty is not None:
+            self.canvas.blit(dirty)
+
+    def _plot_indices(self, n: int) -> np.ndarray:
+        """Indici dei punti da disegnare: passo costante per ~2 campioni per pixel, ultimo punto incluso."""
+        max_points = max(int(self.fig.bbox.width * 2), 2)
+        if n <= max_points:
+            return np.arange(n)
+        idx = np.arange(0, n, n // max_points)
+        if idx[-1] != n - 1:
+            idx = np.append(idx, n - 1)
+        return idx
+
+    def _set_contrib_fill(self, x, y) -> None:
+        """Area dei contributi: aggiornata sul posto (matplotlib >= 3.10), altrimenti ricreata."""
+        fill = self._contrib_fill
+        if fill is not None and hasattr(fill, "set_data"):
+            fill.set_data(x, y, 0)
+            return
+        if fill is not None:
+            fill.remove()
+        # bordi solo orizzontali/verticali (step) e trasparenza bassa: l'antialiasing non si vede, costa e basta
+        self._contrib_fill = self._value_ax.fill_between(
+            x, y, step="pre", alpha=0.18, color=_CONTRIB_COLOR, antialiased=False
+        )
+
+    def _on_resize(self, _event) -> None:
+        # canvas più largo (o più stretto): il passo di campionamento va rifatto
+        if self._plot_x is None:
+            return
+        plot_idx = self._plot_indices(len(self._plot_x))
+        if len(plot_idx) == self._plot_len:
+            return
+        self._plot_len = len(plot_idx)
+        x_plot = self._plot_x[plot_idx]
+        for line, values in self._plot_lines:
+            line.set_data(x_plot, values[plot_idx])
+        contrib = self._plot_lines[-1][1]
+        self._set_contrib_fill(x_plot, contrib[plot_idx])
 
     def _on_draw_event(self, _event) -> None:
         self._update_event_label_positions()
+        # limiti o dimensioni possono essere cambiati: posizioni in pixel da rifare
+        self._ev_px = None
+        # dopo ogni ridisegno completo (recompute, resize) si riprende lo sfondo
+        self._hover_bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._hover_extents = self._draw_hover_artists()
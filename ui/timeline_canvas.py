@@ -108,6 +108,8 @@ class TimelineCanvas(QGraphicsView):
             | QPainter.RenderHint.Antialiasing
             | QPainter.RenderHint.TextAntialiasing
         )
+        # Solo item standard, che impostano da sé pen e brush: niente save/restore per item
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState, True)
 
         # No scroll/drag
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)